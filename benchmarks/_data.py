@@ -0,0 +1,87 @@
+"""Synthetic source files for benchmarks
+"""
+
+import csv
+import json
+
+VOCAB_KEYS = ['word', 'meaning', 'dict_pos', 'from', 'extension', 'variations', 'examples']
+
+def _examples(i):
+  return json.dumps([
+    {"original": "example {} a".format(i), "translated": "例句 {} a".format(i)},
+    {"original": "example {} b".format(i), "translated": "例句 {} b".format(i)},
+  ])
+
+def _english_vocab(i):
+  kind = i % 6
+  if kind == 0:
+    return ["house{}".format(i), "房子,家,住宅", "n.", "", json.dumps({"singular": "house", "plural": "houses"}), json.dumps({"formats": ["plural"]}), _examples(i)]
+  if kind == 1:
+    return ["cat{}".format(i), "猫", "n.", "", json.dumps({"singular": "cat", "plural": "cats"}), "", "[]"]
+  if kind == 2:
+    return ["big{}".format(i), "大", "adj.", "", json.dumps({"original": "big", "comparative": "bigger", "superlative": "biggest"}), json.dumps({"formats": ["comparative"]}), _examples(i)]
+  if kind == 3:
+    return ["ran{}".format(i), "跑", "v.", "", json.dumps({"original": "run", "past_tense": "ran", "past_participle": "run", "present_participle": "running", "3": "runs"}), json.dumps({"formats": ["past_tense"]}), _examples(i)]
+  if kind == 4:
+    return ["go{}".format(i), "去", "vt.vi.", "", json.dumps({"original": "go", "past_tense": "went"}), "", "[]"]
+  return ["dog{}".format(i), "狗", "n.", "", "", "", _examples(i)]
+
+def _spanish_vocab(i):
+  kind = i % 5
+  if kind == 0:
+    return ["casa{}".format(i), "房子,家", "f.", "", json.dumps({"fpl": "casas"}), "", "[]"]
+  if kind == 1:
+    return ["rojo{}".format(i), "红", "adj.", "", json.dumps({"m": "rojo", "f": "roja", "mpl": "rojos", "fpl": "rojas"}), "", "[]"]
+  if kind == 2:
+    conj = {"yo": "hablo", "tú": "hablas", "él/ella/Usted": "habla", "nosotros": "hablamos", "vosotros": "habláis", "ellos/ellas/Ustedes": "hablan"}
+    return ["hablo{}".format(i), "说", "verb.", "", json.dumps({"indicativo-presente": conj}), json.dumps({"original": "hablar", "formats": [{"tense": "indicativo-presente", "person": "yo"}]}), "[]"]
+  if kind == 3:
+    return ["hablado{}".format(i), "说", "verb.", "", "", json.dumps({"original": "hablar", "formats": [{"format": "participio"}]}), "[]"]
+  return ["mesa{}".format(i), "桌子", "f.", "", "", "", "[]"]
+
+def write_vocab_csv(path, rows, lang="en"):
+  """Write vocabulary csv file with ``rows`` records of mixed PoS
+  """
+
+  make = _english_vocab if lang == "en" else _spanish_vocab
+  with open(path, "w", newline="") as f:
+    w = csv.writer(f, delimiter="\t")
+    w.writerow(VOCAB_KEYS)
+    for i in range(rows):
+      w.writerow(make(i))
+  return path
+
+def write_phrase_csv(path, rows):
+  """Write phrase csv file with ``rows`` sentences
+  """
+
+  with open(path, "w", newline="") as f:
+    w = csv.writer(f, delimiter="\t")
+    w.writerow(["sentence", "noun_phrases", "verbs"])
+    for i in range(rows):
+      w.writerow([
+        json.dumps({"text": "Sentence {}".format(i), "meaning": "句子 {}".format(i)}),
+        json.dumps([{"text": "phrase {}".format(j), "meaning": "短语 {}".format(j)} for j in range(4)]),
+        json.dumps([{"text": "ran", "lemma": "run", "form": "verb, past tense"} for j in range(3)]),
+      ])
+  return path
+
+def structure_kg_records(rows):
+  """Generate ``rows`` structure kg records
+  """
+
+  for i in range(rows):
+    yield {
+      "sentence": {"text": "Sentence {}".format(i), "meaning": "句子 {}".format(i)},
+      "structure": [{"text": "Sentence", "meaning": "句子", "explanation": True}, {"text": "{}".format(i), "meaning": "", "explanation": False}],
+      "structure_rep": "S + V + O",
+      "kg": {"tense": [{"text": "past tense"}], "vocabulary": [{"text": "sentence"}]},
+    }
+
+def write_structure_kg_json(path, rows):
+  """Write structure kg json file with ``rows`` sentences
+  """
+
+  with open(path, "w") as f:
+    json.dump(list(structure_kg_records(rows)), f, ensure_ascii=False)
+  return path
@@ -0,0 +1,46 @@
+"""Track cold start of every command registered in pyproject.toml
+
+  $ python benchmarks/bench_import_time.py --repeat 5
+
+For each entry point, a fresh interpreter imports the command module, and another one runs the
+command with ``--help``, the best wall time of ``--repeat`` runs is reported. ``python -c pass``
+is reported as the interpreter baseline.
+"""
+
+import click
+import os
+import re
+import subprocess
+import sys
+import time
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _entry_points():
+  with open(os.path.join(_ROOT, "pyproject.toml")) as f:
+    text = f.read()
+  section = text.split("[tool.poetry.scripts]", 1)[1].split("\n[", 1)[0]
+  return re.findall(r"^(\w+)\s*=\s*['\"]([\w.]+):(\w+)['\"]", section, re.M)
+
+def _best(code, repeat):
+  env = dict(os.environ, PYTHONPATH=_ROOT)
+  best = None
+  for _ in range(repeat):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    elapsed = time.perf_counter() - start
+    best = elapsed if best is None else min(best, elapsed)
+  return best * 1000
+
+@click.command()
+@click.option("--repeat", default=5, help="Specify the number of runs per measurement, the best one is reported")
+def main(repeat):
+  print("{:<28}{:>12}{:>12}".format("command", "import ms", "--help ms"))
+  print("{:<28}{:>12.0f}{:>12}".format("python -c pass", _best("pass", repeat), "-"), flush=True)
+  for name, module, func in _entry_points():
+    imported = _best("import {}".format(module), repeat)
+    helped = _best("import sys; from {} import {} as f; sys.argv = ['{}', '--help']; f()".format(module, func, name), repeat)
+    print("{:<28}{:>12.0f}{:>12.0f}".format(name, imported, helped), flush=True)
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,55 @@
+"""Show peak memory of pdf2images stays flat as pdfs grow when pages are streamed
+
+  $ python benchmarks/bench_pdf2images_memory.py --pages 20,100,400
+
+Every run happens in a fresh process, whose peak RSS is reported. ``--chunk-pages 0`` keeps all
+pages in memory before saving them, like ``pdf2images`` used to.
+"""
+
+from linguappt.lib import pdf2images
+from PIL import Image, ImageDraw
+import click
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+def _write_pdf(path, pages):
+  images = []
+  for i in range(pages):
+    image = Image.new("RGB", (1280, 720), (255, 255, 255))
+    ImageDraw.Draw(image).text((100, 100), "slide {}".format(i), fill=(0, 0, 0))
+    images.append(image)
+  images[0].save(path, save_all=True, append_images=images[1:])
+  return path
+
+def _measure(pdf, imgdir, chunk_pages, result):
+  start = time.perf_counter()
+  count = pdf2images(pdf, imgdir, 0, None, chunk_pages)
+  seconds = time.perf_counter() - start
+  result.put((count, seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+def _run(pdf, imgdir, chunk_pages):
+  ctx = multiprocessing.get_context("spawn")
+  result = ctx.Queue()
+  process = ctx.Process(target=_measure, args=(pdf, imgdir, chunk_pages, result))
+  process.start()
+  measured = result.get()
+  process.join()
+  return measured
+
+@click.command()
+@click.option("--pages", default="20,100,400", help="Specify comma separated pdf page counts")
+@click.option("--chunk-pages", default=8, help="Specify the number of pages in memory at a time, 0 keeps all pages")
+def main(pages, chunk_pages):
+  print("{:>8}{:>14}{:>14}{:>14}".format("pages", "images", "seconds", "peak MB"))
+  with tempfile.TemporaryDirectory() as tmp:
+    for n in [int(p) for p in pages.split(",")]:
+      pdf = _write_pdf(os.path.join(tmp, "{}.pdf".format(n)), n)
+      imgdir = os.path.join(tmp, "img{}".format(n))
+      count, seconds, rss = _run(pdf, imgdir, chunk_pages or None)
+      print("{:>8}{:>14}{:>14.2f}{:>14.0f}".format(n, count, seconds, rss / 1024), flush=True)
+
+if __name__ == "__main__":
+  main()
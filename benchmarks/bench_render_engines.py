@@ -0,0 +1,40 @@
+"""Compare slide rendering engines on throughput
+
+  $ python benchmarks/bench_render_engines.py --rows 500
+"""
+
+from linguappt import EnglishVocabPPT, SpanishVocabPPT, EnglishPhrasePPT, EnglishStructureKGPPT
+from linguappt.deck import ENGINES
+from _data import write_vocab_csv, write_phrase_csv, write_structure_kg_json
+import click
+import os
+import tempfile
+import time
+
+@click.command()
+@click.option("--rows", default=500, help="Specify the number of records per deck")
+@click.option("--repeat", default=3, help="Specify the number of runs per engine, the best one is reported")
+def main(rows, repeat):
+  with tempfile.TemporaryDirectory() as tmp:
+    jobs = [
+      (EnglishVocabPPT, write_vocab_csv(os.path.join(tmp, "en.csv"), rows, "en")),
+      (SpanishVocabPPT, write_vocab_csv(os.path.join(tmp, "es.csv"), rows, "es")),
+      (EnglishPhrasePPT, write_phrase_csv(os.path.join(tmp, "phrase.csv"), rows)),
+      (EnglishStructureKGPPT, write_structure_kg_json(os.path.join(tmp, "skg.json"), rows)),
+    ]
+    dest = os.path.join(tmp, "out.pptx")
+    print("{:<24}{:>12}{:>10}{:>14}".format("class", "engine", "slides", "slides/s"))
+    for cls, source in jobs:
+      for engine in ENGINES:
+        best = None
+        for _ in range(repeat):
+          start = time.perf_counter()
+          vp = cls(source, "benchmark")
+          vp.convert_to_ppt(dest, engine)
+          elapsed = time.perf_counter() - start
+          best = elapsed if best is None else min(best, elapsed)
+        slides = len(vp._prs.slides)
+        print("{:<24}{:>12}{:>10}{:>14.1f}".format(cls.__name__, engine, slides, slides / best))
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,45 @@
+"""Show time per slide stays flat as decks grow
+
+  $ python benchmarks/bench_slide_allocation.py --sizes 100,1000,5000,20000
+
+With ``--baseline`` the same slides are also added through python-pptx ``add_slide`` and
+``notes_slide``, whose part name and relationship id lookups scan existing parts.
+"""
+
+from linguappt import EnglishVocabPPT
+from linguappt.deck import Deck
+import click
+import time
+
+def _deck_run(size, engine):
+  deck = Deck(EnglishVocabPPT, engine=engine)
+  start = time.perf_counter()
+  for i in range(size):
+    slide, holders = deck.add_slide("Default")
+    holders[11].text_frame.text = "word {}".format(i)
+    deck.set_notes(slide, "word {}".format(i))
+  return time.perf_counter() - start
+
+def _pptx_run(size):
+  prs = Deck(EnglishVocabPPT).prs
+  layout = prs.slide_layouts.get_by_name("Default")
+  start = time.perf_counter()
+  for i in range(size):
+    slide = prs.slides.add_slide(layout)
+    slide.shapes.placeholders[11].text_frame.text = "word {}".format(i)
+    slide.notes_slide.notes_text_frame.text = "word {}".format(i)
+  return time.perf_counter() - start
+
+@click.command()
+@click.option("--sizes", default="100,1000,5000,20000", help="Specify comma separated deck sizes")
+@click.option("--engine", default="stamp", help="Specify the slide rendering engine")
+@click.option("--baseline", is_flag=True, help="Also measure python-pptx add_slide, which is slow for large decks")
+def main(sizes, engine, baseline):
+  print("{:>8}{:>16}{:>16}".format("slides", "deck us/slide", "pptx us/slide"))
+  for size in [int(s) for s in sizes.split(",")]:
+    deck = _deck_run(size, engine) / size * 1e6
+    pptx = "{:.0f}".format(_pptx_run(size) / size * 1e6) if baseline else "-"
+    print("{:>8}{:>16.0f}{:>16}".format(size, deck, pptx), flush=True)
+
+if __name__ == "__main__":
+  main()
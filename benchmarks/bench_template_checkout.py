@@ -0,0 +1,33 @@
+"""Compare template checkout sharing unchanged parts with a deep copy of the whole package, and with parsing
+
+  $ python benchmarks/bench_template_checkout.py --repeat 200
+
+Sharing copies only the package and presentation part, masters, layouts, themes and media are
+shared with the cached template.
+"""
+
+from linguappt.template_cache import TemplateCache, registered_classes
+from pptx import Presentation
+import click
+import time
+
+def _run(repeat, fn):
+  start = time.perf_counter()
+  for _ in range(repeat):
+    fn()
+  return (time.perf_counter() - start) / repeat * 1e3
+
+@click.command()
+@click.option("--repeat", default=200, help="Specify the number of checkouts per template")
+def main(repeat):
+  cache = TemplateCache()
+  print("{:>24}{:>12}{:>12}{:>12}".format("class", "share ms", "copy ms", "parse ms"))
+  for cls in registered_classes():
+    cache.checkout(cls)
+    share = _run(repeat, lambda: cache.checkout(cls, share=True))
+    deep = _run(repeat, lambda: cache.checkout(cls))
+    parse = _run(max(1, repeat // 10), lambda: Presentation(cls._templates["classic"]))
+    print("{:>24}{:>12.2f}{:>12.2f}{:>12.2f}".format(cls.__name__, share, deep, parse), flush=True)
+
+if __name__ == "__main__":
+  main()
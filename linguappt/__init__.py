@@ -57,13 +57,34 @@ This module demostrates the usage of package `linguappt`.
 __version__ = '0.1.22'
 
 
-from .es.vocab_summary import SpanishVocabPPT
-from .en.vocab_summary import EnglishVocabPPT
+import importlib
 
-from .en.phrase_summary import EnglishPhrasePPT
-from .es.phrase_summary import SpanishPhrasePPT
-from .de.phrase_summary import GermanPhrasePPT
+_LAZY_CLASSES = {
+  "SpanishVocabPPT": ".es.vocab_summary",
+  "EnglishVocabPPT": ".en.vocab_summary",
 
-from .en.structure_kg_summary import EnglishStructureKGPPT
-from .es.structure_kg_summary import SpanishStructureKGPPT
-from .de.structure_kg_summary import GermanStructureKGPPT
+  "EnglishPhrasePPT": ".en.phrase_summary",
+  "SpanishPhrasePPT": ".es.phrase_summary",
+  "GermanPhrasePPT": ".de.phrase_summary",
+
+  "EnglishStructureKGPPT": ".en.structure_kg_summary",
+  "SpanishStructureKGPPT": ".es.structure_kg_summary",
+  "GermanStructureKGPPT": ".de.structure_kg_summary",
+}
+
+__all__ = list(_LAZY_CLASSES)
+
+
+def __getattr__(name):
+  """Import ppt classes on first use, so that importing ``linguappt`` does not load python-pptx
+  """
+
+  if name not in _LAZY_CLASSES:
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+  cls = getattr(importlib.import_module(_LAZY_CLASSES[name], __name__), name)
+  globals()[name] = cls
+  return cls
+
+
+def __dir__():
+  return sorted(set(globals()) | set(__all__))
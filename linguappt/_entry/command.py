@@ -1,12 +1,18 @@
-from linguappt import SpanishVocabPPT, EnglishVocabPPT
-from linguappt import EnglishPhrasePPT, SpanishPhrasePPT, GermanPhrasePPT
-from linguappt import EnglishStructureKGPPT, SpanishStructureKGPPT, GermanStructureKGPPT
-from linguappt.lib import pptx2pdf, pdf2images 
+from linguappt.lib import pptx2pdf, pptx2pdf_many, pdf2images, PdfConversionError, IMAGE_FORMATS
+from linguappt.options import ENGINES
+from linguappt.batch import ppt_class, read_manifest, run_batch
+from linguappt import media
+from linguappt.media_cache import MediaCache
+from linguappt import slide_images
+from linguappt import worker as _worker
 from linguappt import __version__
 import click
 import json
 import os
+import sys
  
+_NOTES = {"on": True, "off": False, "lazy": "lazy"}
+
 def _print_version(ctx, param, value):
   if not value or ctx.resilient_parsing:
       return
@@ -18,21 +24,25 @@ def _print_version(ctx, param, value):
 @click.option("--title", prompt="title of the pptx", help="Specify the title of the pptx")
 @click.option("--lang", prompt="language", help="Specify the language")
 @click.option("--destpptx", default="test.pptx", prompt="destination pptx file", help="Specify the destination pptx file name")
-def vocabppt(sourcecsv, title, lang, destpptx):
-  _PPTS = {
-    "en": EnglishVocabPPT,
-    "es": SpanishVocabPPT
-  }
-
-  _PPT = _PPTS[lang]
+@click.option("--engine", default="add_slide", type=click.Choice(ENGINES), help="Specify the slide rendering engine")
+@click.option("--notes", default="on", type=click.Choice(list(_NOTES)), help="Specify whether speaker notes are written, on, off or lazy")
+@click.option("--incremental", is_flag=True, help="Reuse slides of records unchanged since the previous build of the destination pptx")
+@click.option("--deterministic", is_flag=True, help="Save the same bytes for the same source and title, with fixed zip timestamps")
+@click.option("--compact", is_flag=True, help="Leave slide layouts no slide uses, and their media, out of the pptx")
+def vocabppt(sourcecsv, title, lang, destpptx, engine, notes, incremental, deterministic, compact):
+  _PPT = ppt_class("VOCAB", lang)
 
   phase = {"step": 1, "msg": "Start ppt generation"}
   print(json.dumps(phase))
 
   vp = _PPT(sourcecsv, title)
-  vp.convert_to_ppt(destpptx)
+  vp.convert_to_ppt(destpptx, engine, _NOTES[notes], incremental, deterministic, compact)
 
   phase = {"step": 2, "msg": "Finish ppt generation"}
+  if incremental:
+    phase.update(reused=vp.reused_records, rebuilt=vp.rebuilt_records)
+  if compact:
+    phase.update(bytes_saved=vp.pruned_bytes)
   print(json.dumps(phase))
 
 
@@ -41,54 +51,87 @@ def vocabppt(sourcecsv, title, lang, destpptx):
 @click.option("--title", prompt="title of the pptx", help="Specify the title of the pptx")
 @click.option("--lang", prompt="language", help="Specify the language")
 @click.option("--destpptx", default="test.pptx", prompt="destination pptx file", help="Specify the destination pptx file name")
-def phraseppt(sourcecsv, title, lang, destpptx):
-  _PPTS = {
-    "en": EnglishPhrasePPT,
-    "es": SpanishPhrasePPT,
-    "de": GermanPhrasePPT
-  }
-
-  _PPT = _PPTS[lang]
+@click.option("--engine", default="add_slide", type=click.Choice(ENGINES), help="Specify the slide rendering engine")
+@click.option("--deterministic", is_flag=True, help="Save the same bytes for the same source and title, with fixed zip timestamps")
+@click.option("--compact", is_flag=True, help="Leave slide layouts no slide uses, and their media, out of the pptx")
+def phraseppt(sourcecsv, title, lang, destpptx, engine, deterministic, compact):
+  _PPT = ppt_class("PHRASE", lang)
 
   phase = {"step": 1, "msg": "Start ppt generation"}
   print(json.dumps(phase))
 
   vp = _PPT(sourcecsv, title)
-  vp.convert_to_ppt(destpptx)
+  vp.convert_to_ppt(destpptx, engine, deterministic, compact)
 
   phase = {"step": 2, "msg": "Finish ppt generation"}
+  if compact:
+    phase.update(bytes_saved=vp.pruned_bytes)
   print(json.dumps(phase))
 
 @click.command()
-@click.option("--sourcejson", prompt="source json file path", help="Specify the source json file path")
+@click.option("--sourcejson", prompt="source json file path", help="Specify the source json file path, either a json array or json lines")
 @click.option("--title", prompt="title of the pptx", help="Specify the title of the pptx")
 @click.option("--lang", prompt="language", help="Specify the language")
 @click.option("--destpptx", default="test.pptx", prompt="destination pptx file", help="Specify the destination pptx file name")
-def structurekgppt(sourcejson, title, lang, destpptx):
-  _PPTS = {
-    "en": EnglishStructureKGPPT,
-    "es": SpanishStructureKGPPT,
-    "de": GermanStructureKGPPT
-  }
-
-  _PPT = _PPTS[lang]
+@click.option("--engine", default="add_slide", type=click.Choice(ENGINES), help="Specify the slide rendering engine")
+@click.option("--deterministic", is_flag=True, help="Save the same bytes for the same source and title, with fixed zip timestamps")
+@click.option("--compact", is_flag=True, help="Leave slide layouts no slide uses, and their media, out of the pptx")
+def structurekgppt(sourcejson, title, lang, destpptx, engine, deterministic, compact):
+  _PPT = ppt_class("SKG", lang)
 
   phase = {"step": 1, "msg": "Start ppt generation"}
   print(json.dumps(phase))
 
   vp = _PPT(sourcejson, title)
-  vp.convert_to_ppt(destpptx)
+  vp.convert_to_ppt(destpptx, engine, deterministic, compact)
 
   phase = {"step": 2, "msg": "Finish ppt generation"}
+  if compact:
+    phase.update(bytes_saved=vp.pruned_bytes)
   print(json.dumps(phase))
 
 
 
 
+@click.command()
+@click.option("--manifest", prompt="manifest file path", help="Specify the manifest, csv or json lines with ptype, lang, source, title and dest of every deck")
+@click.option("--processes", default=None, type=int, help="Specify the number of worker processes, default is the number of cpus")
+@click.option("--engine", default="add_slide", type=click.Choice(ENGINES), help="Specify the slide rendering engine")
+@click.option("--deterministic", is_flag=True, help="Save the same bytes for the same source and title, with fixed zip timestamps")
+@click.option("--compact", is_flag=True, help="Leave slide layouts no slide uses, and their media, out of the pptx")
+@click.option("--notes", default="on", type=click.Choice(list(_NOTES)), help="Specify whether speaker notes of vocabulary decks are written, on, off or lazy")
+def batch(manifest, processes, engine, deterministic, compact, notes):
+  jobs = read_manifest(manifest)
+  phase = {"step": 0, "msg": "Start batch", "jobs": len(jobs)}
+  print(json.dumps(phase), flush=True)
+
+  failed = 0
+  for event in run_batch(jobs, processes, engine, deterministic, compact, _NOTES[notes]):
+    if "error" in event:
+      failed += 1
+    print(json.dumps(event, ensure_ascii=False), flush=True)
+
+  phase = {"step": 3, "msg": "Finish batch", "jobs": len(jobs), "failed": failed}
+  print(json.dumps(phase), flush=True)
+  if failed > 0:
+    sys.exit(1)
+
+
 @click.command()
 @click.option("--sourcepptx", prompt="source pptx file path", help="Sepcify the source pptx file path")
 @click.option("--destdir", prompt="dest pdf and pictures directory", help="Sepcify the pdf and picture destionation directory")
-def pptx2pdf2images(sourcepptx, destdir):
+@click.option("--fmt", default="jpg", type=click.Choice(list(IMAGE_FORMATS)), help="Specify the image format")
+@click.option("--quality", default=None, type=int, help="Specify the jpg or webp encoder quality")
+@click.option("--widths", default=None, help="Specify comma separated image widths, full keeps the rasterized size, e.g, 200,800,full")
+@click.option("--incremental", is_flag=True, help="Render only slides changed since images were last rendered into destdir, the pdf is not written")
+def pptx2pdf2images(sourcepptx, destdir, fmt, quality, widths, incremental):
+  if widths is not None:
+    widths = [None if w == "full" else int(w) for w in widths.split(",")]
+  if incremental:
+    for phase in slide_images.pptx2images(sourcepptx, destdir, fmt, quality, widths):
+      print(json.dumps(phase))
+    return
+
   phase = {"step": 1, "msg": "Start pdf generation"}
   print(json.dumps(phase))
 
@@ -100,12 +143,32 @@ def pptx2pdf2images(sourcepptx, destdir):
   phase = {"step": 3, "msg": "Start images generation"}
   print(json.dumps(phase))
 
-  images_len = pdf2images(pdf, destdir)
+  images_len = pdf2images(pdf, destdir, fmt=fmt, quality=quality, widths=widths)
    
   phase = {"step": 4, "msg": "Finish images generation", "images_len": images_len}
   print(json.dumps(phase))
 
 
+@click.command()
+@click.argument("sourcepptx", nargs=-1, required=True)
+@click.option("--destdir", prompt="dest pdf directory", help="Sepcify the pdf destionation directory")
+@click.option("--chunk-size", default=20, type=int, help="Specify the number of pptx files converted by one office process")
+@click.option("--processes", default=None, type=int, help="Specify the number of office processes running at the same time, default is the number of cpus")
+def pptx2pdf_batch(sourcepptx, destdir, chunk_size, processes):
+  phase = {"step": 1, "msg": "Start pdf generation", "files": len(sourcepptx)}
+  print(json.dumps(phase), flush=True)
+
+  try:
+    pdfs = pptx2pdf_many(list(sourcepptx), destdir, chunk_size, processes)
+  except PdfConversionError as e:
+    phase = {"step": 2, "msg": "Fail pdf generation", "missing": e.missing}
+    print(json.dumps(phase), flush=True)
+    sys.exit(1)
+
+  phase = {"step": 2, "msg": "Finish pdf generation", "pdfs": pdfs}
+  print(json.dumps(phase), flush=True)
+
+
 @click.command()
 @click.option('--version', is_flag=True, callback=_print_version, expose_value=False, is_eager=True)
 @click.option('--ptype', prompt="parser type[VOCAB | PHRASE | SKG]", help="Specify the parse type, VOCAB or PHRASE or SKG")
@@ -115,42 +178,37 @@ def pptx2pdf2images(sourcepptx, destdir):
 @click.option("--pptxdir", prompt="dest pptx directory", help="Specify the pptx destination directory")
 @click.option("--pdfdir", prompt="dest pdf directory", help="Sepcify the pdf destionation directory")
 @click.option("--imgdir", prompt="dest image directory", help="Sepcify the preview image destionation directory")
-def meta2media(ptype, sourcemeta, lang, name, pptxdir, pdfdir, imgdir):
-  _PPTS = {
-    "en_VOCAB": EnglishVocabPPT,
-    "es_VOCAB": SpanishVocabPPT,
-    "en_PHRASE": EnglishPhrasePPT,
-    "es_PHRASE": SpanishPhrasePPT,
-    "de_PHRASE": GermanPhrasePPT,
-    "en_SKG": EnglishStructureKGPPT,
-    "es_SKG": SpanishStructureKGPPT,
-    "de_SKG": GermanStructureKGPPT,
-  }
-
-  _PPT = _PPTS[lang+"_"+ptype]
-  phase = {"step": 1, "msg": "Start ppt generation"}
-  print(json.dumps(phase), flush=True)
-
-  if not os.path.isdir(pptxdir):
-    os.mkdir(pptxdir) 
-
-  vp = _PPT(sourcemeta, "歧舌AI备课助教")
-  pptx = pptxdir + "/" + name +'.pptx'
-  vp.convert_to_ppt(pptx)
-
-  phase = {"step": 2, "msg": "Finish ppt generation, start pdf generation"}
-  print(json.dumps(phase), flush=True)
+@click.option("--preview", is_flag=True, help="Render preview images from a sub-deck of the preview slides, before the full pdf")
+@click.option("--background", is_flag=True, help="With --preview, do not wait for the full pdf")
+@click.option("--cachedir", default=None, help="Specify the output cache directory, default is no caching")
+@click.option("--cache-size", default=1024, help="Specify the output cache size cap in MB")
+@click.option("--compact", is_flag=True, help="Leave slide layouts no slide uses, and their media, out of the pptx")
+@click.option("--notes", default="on", type=click.Choice(list(_NOTES)), help="Specify whether speaker notes of vocabulary decks are written, on, off or lazy")
+def meta2media(ptype, sourcemeta, lang, name, pptxdir, pdfdir, imgdir, preview, background, cachedir, cache_size, compact, notes):
+  cache = None if cachedir is None else MediaCache(cachedir, cache_size << 20)
+  for phase in media.meta2media(ptype, sourcemeta, lang, name, pptxdir, pdfdir, imgdir, preview=preview, background=background, cache=cache, compact=compact, notes=_NOTES[notes]):
+    print(json.dumps(phase), flush=True)
 
-  if not os.path.isdir(pdfdir):
-    os.mkdir(pdfdir) 
-
-  pdf = pptx2pdf(pptx, pdfdir)
-
-  phase = {"step": 3, "msg": "Finish pdf generation, start images generation"}
-  print(json.dumps(phase), flush=True)
-
-  images_len = pdf2images(pdf, imgdir, 0, 6)
-   
-  phase = {"step": 4, "msg": "Finish images generation", "images_len": images_len}
-  print(json.dumps(phase), flush=True)
 
+@click.command()
+@click.option("--processes", default=None, type=int, help="Specify the number of worker processes, default is the number of cpus")
+@click.option("--socket", "socket_path", default=None, help="Specify the unix socket path to accept jobs from, default is reading jobs from stdin")
+@click.option("--office", default=0, type=int, help="Specify the number of warm office instances per worker for pdf conversion, 0 launches office per conversion")
+def worker(processes, socket_path, office):
+  pool = _worker.WorkerPool(processes, office)
+  try:
+    if socket_path is None:
+      _worker.serve_stdin(pool)
+    else:
+      server = _worker.make_server(pool, socket_path)
+      phase = {"step": 0, "msg": "Start worker", "socket": socket_path}
+      print(json.dumps(phase), flush=True)
+      try:
+        server.serve_forever()
+      except KeyboardInterrupt:
+        pass
+      finally:
+        server.server_close()
+        os.unlink(socket_path)
+  finally:
+    pool.close()
@@ -1,13 +1,14 @@
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.dml.color import RGBColor
+from linguappt.batch import ppt_class
 
 import os
+import json
+import sys
 
 import click
 @click.command()
 @click.option("--pptx", prompt="pptx file", help="Specify the pptx file to be validated")
 def validate(pptx):
+  from pptx import Presentation
   prs = Presentation(pptx)
 
   templates = prs.slide_layouts
@@ -18,4 +19,16 @@ def validate(pptx):
     print('Template {}-{}'.format(index+1, t.name))
     for e in holders:
       print('  %d %s' % (e.placeholder_format.idx, e.name))
-   
+
+@click.command()
+@click.option("--ptype", type=click.Choice(["VOCAB", "PHRASE", "SKG"]), prompt="ppt type", help="Specify the ppt type")
+@click.option("--lang", prompt="language", help="Specify the language")
+@click.option("--source", prompt="source file path", help="Specify the source csv or json file to be validated")
+def validate_source(ptype, lang, source):
+  _PPT = ppt_class(ptype, lang)
+  errors = _PPT.validate_source(source)
+  for line, msg in errors:
+    print(json.dumps({"line": line, "msg": msg}))
+  print(json.dumps({"valid": len(errors) == 0, "errors": len(errors)}))
+  if len(errors) > 0:
+    sys.exit(1)
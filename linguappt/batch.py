@@ -0,0 +1,191 @@
+import linguappt
+from linguappt.lib import iter_json
+from linguappt.template_cache import prewarm_templates
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import collections
+import csv
+import os
+import time
+
+MANIFEST_KEYS = ["ptype", "lang", "source", "title", "dest"]
+"""Columns of a batch manifest, every row describes one deck
+
+  * ``ptype``: ppt type, ``VOCAB``, ``PHRASE`` or ``SKG``
+  * ``lang``: language, e.g, ``en``
+  * ``source``: source csv or json file
+  * ``title``: title shown in ppt
+  * ``dest``: destination pptx file
+"""
+
+
+def ppt_class(ptype, lang):
+  """Return the ppt class rendering ``ptype`` decks in ``lang``
+
+  Args:
+    ptype (str): ppt type, ``VOCAB``, ``PHRASE`` or ``SKG``
+    lang (str): language, e.g, ``en``
+
+  Returns:
+    type: ppt class
+
+  Raises:
+    ValueError: if there is no ppt class for ``ptype`` and ``lang``
+  """
+
+  _PPTS = {
+    "en_VOCAB": "EnglishVocabPPT",
+    "es_VOCAB": "SpanishVocabPPT",
+    "en_PHRASE": "EnglishPhrasePPT",
+    "es_PHRASE": "SpanishPhrasePPT",
+    "de_PHRASE": "GermanPhrasePPT",
+    "en_SKG": "EnglishStructureKGPPT",
+    "es_SKG": "SpanishStructureKGPPT",
+    "de_SKG": "GermanStructureKGPPT",
+  }
+
+  try:
+    name = _PPTS[lang+"_"+ptype]
+  except KeyError:
+    raise ValueError("no ppt class for ptype {} and lang {}".format(ptype, lang))
+  return getattr(linguappt, name)
+
+
+def read_manifest(filename):
+  """Read batch manifest, either csv with header or json lines
+
+  Csv manifests are comma or tab separated, the delimiter is detected from the header.
+
+  Args:
+    filename (str): manifest file, ``.jsonl`` or ``.json`` files are read as json
+
+  Returns:
+    list of dict: jobs, each has keys in :data:`MANIFEST_KEYS`
+
+  Raises:
+    ValueError: if any job misses keys in :data:`MANIFEST_KEYS`
+  """
+
+  if filename.endswith((".jsonl", ".json")):
+    jobs = list(iter_json(filename))
+  else:
+    with open(filename, newline="") as f:
+      header = f.readline()
+      delimiter = "\t" if header.count("\t") > header.count(",") else ","
+      f.seek(0)
+      jobs = list(csv.DictReader(f, delimiter=delimiter, skipinitialspace=True))
+
+  for index, job in enumerate(jobs, 1):
+    missing = [k for k in MANIFEST_KEYS if not job.get(k)]
+    if len(missing) > 0:
+      raise ValueError("job {} in {} misses {}".format(index, filename, ", ".join(missing)))
+  return jobs
+
+
+def run_job(job, engine="add_slide", deterministic=False, compact=False, notes=True):
+  """Render the deck of one manifest job, in the current process
+
+  Args:
+    job (dict): job with keys in :data:`MANIFEST_KEYS`
+    engine (str): slide rendering engine, one of ``linguappt.deck.ENGINES``
+    deterministic (bool): save the same bytes for the same source and title
+    compact (bool): leave unused slide layouts and their media out of the pptx, reporting ``bytes_saved``
+    notes (bool or str): speaker notes mode of vocabulary decks, one of ``linguappt.deck.NOTES``, other decks have no notes
+
+  Returns:
+    list of dict: phase events of the job
+  """
+
+  events = [{"step": 1, "msg": "Start ppt generation", "dest": job["dest"]}]
+  start = time.perf_counter()
+  try:
+    _PPT = ppt_class(job["ptype"], job["lang"])
+    destdir = os.path.dirname(job["dest"])
+    if destdir != "" and not os.path.isdir(destdir):
+      os.makedirs(destdir, exist_ok=True)
+    vp = _PPT(job["source"], job["title"])
+    options = {"notes": notes} if job["ptype"] == "VOCAB" else {}
+    vp.convert_to_ppt(job["dest"], engine, deterministic=deterministic, compact=compact, **options)
+  except Exception as e:
+    events.append({"step": 2, "msg": "Fail ppt generation", "error": "{}: {}".format(type(e).__name__, e)})
+  else:
+    event = {"step": 2, "msg": "Finish ppt generation", "seconds": round(time.perf_counter() - start, 3)}
+    if compact:
+      event["bytes_saved"] = vp.pruned_bytes
+    events.append(event)
+  return events
+
+
+def run_batch(jobs, processes=None, engine="add_slide", deterministic=False, compact=False, notes=True):
+  """Render the decks of manifest jobs over a process pool, whose workers parse all templates once at startup
+
+  Args:
+    jobs (list of dict): jobs read by :func:`read_manifest`
+    processes (int): number of worker processes, default is the number of cpus, ``1`` renders in the current process
+    engine (str): slide rendering engine, one of ``linguappt.deck.ENGINES``
+    deterministic (bool): save the same bytes for the same source and title
+    compact (bool): leave unused slide layouts and their media out of the pptx, reporting ``bytes_saved``
+    notes (bool or str): speaker notes mode of vocabulary decks, one of ``linguappt.deck.NOTES``
+
+  Yields:
+    dict: phase event of a job, with ``job`` counting from 1 in manifest order. Over a process pool,
+    the start event is yielded as the job is submitted, the others as it finishes
+
+  Note:
+    Over a process pool, at most ``processes`` jobs are submitted at a time. If a worker dies, the
+    jobs in flight fail and the pool is started again for the remaining jobs, including jobs the
+    broken pool refused.
+  """
+
+  if processes == 1:
+    prewarm_templates()
+    for index, job in enumerate(jobs, 1):
+      for event in run_job(job, engine, deterministic, compact, notes):
+        yield dict(event, job=index)
+    return
+
+  workers = processes or os.cpu_count() or 1
+  queued = collections.deque(enumerate(jobs, 1))
+  running = {}
+  pool = None
+  try:
+    while len(queued) > 0 or len(running) > 0:
+      if pool is None:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=prewarm_templates)
+      broken = False
+      while len(queued) > 0 and len(running) < workers:
+        index, job = queued[0]
+        try:
+          running[pool.submit(run_job, job, engine, deterministic, compact, notes)] = index
+        except BrokenProcessPool:
+          broken = True
+          break
+        queued.popleft()
+        yield {"step": 1, "msg": "Start ppt generation", "dest": job["dest"], "job": index}
+      done = []
+      if len(running) > 0:
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        broken = broken or any(isinstance(future.exception(), BrokenProcessPool) for future in done)
+      if broken:
+        pool.shutdown()
+        pool = None
+        done = list(running)
+      for future in done:
+        for event in _finished_events(future):
+          yield dict(event, job=running[future])
+        del running[future]
+  finally:
+    if pool is not None:
+      for future in running:
+        future.cancel()
+      pool.shutdown()
+
+
+def _finished_events(future):
+  """Return events of a finished job after its start event, a failure if its worker died
+  """
+
+  try:
+    return future.result()[1:]
+  except BrokenProcessPool as e:
+    return [{"step": 2, "msg": "Fail ppt generation", "error": "{}: {}".format(type(e).__name__, e)}]
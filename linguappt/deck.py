@@ -0,0 +1,443 @@
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.constants import RELATIONSHIP_TARGET_MODE as RTM
+from pptx.opc.package import _Relationship
+from pptx.opc.packuri import PackURI
+from pptx.oxml import parse_xml
+from pptx.oxml.slide import CT_NotesSlide
+from pptx.parts.slide import NotesSlidePart, SlidePart
+from pptx.shapes.shapetree import SlideShapeFactory
+from linguappt.template_cache import template_cache
+from linguappt.options import ENGINES, NOTES
+import copy
+import datetime
+import io
+import os
+import zipfile
+import zlib
+
+class SlideHolders:
+  """Constant-time placeholder lookup for a slide newly created from a layout
+
+  It supports ``holders[idx]`` like ``slide.shapes.placeholders[idx]``, but resolves ``idx``
+  through the position table compiled from the layout instead of walking the shape tree.
+  """
+
+  def __init__(self, slide, positions):
+    """Initialize lookup for slide
+
+    Args:
+      slide (pptx.slide.Slide): slide created from layout
+      positions (dict): key is placeholder ``idx``, value is the shape position on the slide
+    """
+
+    self._placeholders = slide.shapes.placeholders
+    self._elms = list(slide.shapes._spTree.iter_shape_elms())
+    self._positions = positions
+
+  def __getitem__(self, idx):
+    try:
+      pos = self._positions[idx]
+    except KeyError:
+      raise KeyError("no placeholder on this slide with idx == %d" % idx)
+    return SlideShapeFactory(self._elms[pos], self._placeholders)
+
+
+class Deck:
+  """Presentation under construction, created from the cached template of a ppt class
+
+  Part names, relationship ids and slide ids of new slides and notes slides are allocated from
+  counters owned by the deck, instead of python-pptx scanning existing parts and relationships for
+  the next free value, so the cost per slide stays flat for very large decks.
+
+  Attributes:
+    prs (pptx.presentation.Presentation): presentation copied from template
+    slides (list of pptx.slide.Slide): slides in the order they are created
+    engine (str): slide rendering engine, one of :data:`ENGINES`
+    notes (bool or str): speaker notes mode, one of :data:`NOTES`
+    deterministic (bool): save the same bytes for the same content, see :meth:`save`
+    compact (bool): prune slide layouts no slide uses on save, see :meth:`prune_layouts`, set before slides are added
+    pruned_bytes (int): size of the parts pruned by :meth:`prune_layouts`
+  """
+
+  def __init__(self, cls, genre="classic", engine="add_slide", notes=True, deterministic=False, compact=False):
+    """Check out template copy and its compiled lookup tables
+
+    Args:
+      cls (type): ppt class, whose class variable ``_templates`` maps genre to template path
+      genre (str): ppt template style
+      engine (str): slide rendering engine, one of :data:`ENGINES`
+      notes (bool or str): speaker notes mode, one of :data:`NOTES`
+      deterministic (bool): save the same bytes for the same content, see :meth:`save`
+      compact (bool): prune slide layouts no slide uses on save, see :meth:`prune_layouts`
+    """
+
+    self._cls = cls
+    self._genre = genre
+    self._checkout(share=not compact)
+    self.slides = []
+    self._prototypes = {}
+    self._notes_prototype = None
+    self._notes_master_part = None
+    self._pending_notes = []
+    self.engine = engine
+    self.notes = notes
+    self.deterministic = deterministic
+    self.compact = compact
+    self.pruned_bytes = 0
+
+  def _checkout(self, share):
+    """Check out the template, sharing its masters and layouts with the cache if ``share`` is set
+    """
+
+    self.prs, compiled = template_cache.checkout(self._cls, self._genre, share=share)
+    self._shared = share
+    self._layouts = compiled.layouts_of(self.prs)
+    self._placeholder_positions = compiled.placeholder_positions
+    self._init_counters()
+
+  @property
+  def compact(self):
+    return self._compact
+
+  @compact.setter
+  def compact(self, compact):
+    # pruning changes masters, so they must not be shared with the template cache
+    if compact and self._shared:
+      if len(self.slides) > 0:
+        raise ValueError("compact mode must be set before slides are added")
+      self._checkout(share=False)
+    self._compact = compact
+
+  @property
+  def engine(self):
+    return self._engine
+
+  @engine.setter
+  def engine(self, engine):
+    if engine not in ENGINES:
+      raise ValueError("unknown engine {}, expected one of {}".format(engine, ", ".join(ENGINES)))
+    self._engine = engine
+
+  @property
+  def notes(self):
+    return self._notes
+
+  @notes.setter
+  def notes(self, notes):
+    if not (notes is True or notes is False or notes == "lazy"):
+      raise ValueError("unknown notes mode {!r}, expected one of True, False, 'lazy'".format(notes))
+    self._notes = notes
+
+  def _init_counters(self):
+    """Scan the template once for part names and ids already in use
+    """
+
+    prs_part = self.prs.part
+    self._prs_part = prs_part
+    self._package = prs_part.package
+    self._sldIdLst = prs_part._element.get_or_add_sldIdLst()
+
+    numbers = {_SLIDE_PARTNAME: 0, _NOTES_SLIDE_PARTNAME: 0}
+    for part in self._package.iter_parts():
+      for tmpl in numbers:
+        n = _partname_number(tmpl, part.partname)
+        if n is not None:
+          numbers[tmpl] = max(numbers[tmpl], n)
+    self._next_partnumber = {tmpl: n + 1 for tmpl, n in numbers.items()}
+    self._next_rId = 1 + max([0] + [_rId_number(rId) for rId in prs_part.rels])
+    self._next_slide_id = 1 + max([255] + [sldId.id for sldId in self._sldIdLst.sldId_lst])
+
+  def _allocate_partname(self, tmpl):
+    n = self._next_partnumber[tmpl]
+    self._next_partnumber[tmpl] = n + 1
+    return PackURI(tmpl % n)
+
+  def _append_slide_part(self, slide_part):
+    """Relate new slide part to presentation and append it to the slide list
+    """
+
+    rId = "rId%d" % self._next_rId
+    self._next_rId += 1
+    rels = self._prs_part.rels
+    rels._rels[rId] = _Relationship(rels._base_uri, rId, RT.SLIDE, RTM.INTERNAL, slide_part)
+    self._sldIdLst._add_sldId(id=self._next_slide_id, rId=rId)
+    self._next_slide_id += 1
+
+  def add_slide(self, layout_name):
+    """Append slide created from layout
+
+    Args:
+      layout_name (str): name of slide layout in template
+
+    Returns:
+      tuple: ``(slide, holders)``, where ``holders[idx]`` is the placeholder with ``idx``
+    """
+
+    layout = self._layouts[layout_name]
+    prototype = self._prototypes.get(layout_name) if self._engine == "stamp" else None
+
+    partname = self._allocate_partname(_SLIDE_PARTNAME)
+    if prototype is None:
+      slide_part = SlidePart.new(partname, self._package, layout.part)
+      slide = slide_part.slide
+      slide.shapes.clone_layout_placeholders(layout)
+      if self._engine == "stamp":
+        self._prototypes[layout_name] = copy.deepcopy(slide._element)
+    else:
+      slide_part = SlidePart(partname, CT.PML_SLIDE, self._package, copy.deepcopy(prototype))
+      slide_part.relate_to(layout.part, RT.SLIDE_LAYOUT)
+      slide = slide_part.slide
+    self._append_slide_part(slide_part)
+    self.slides.append(slide)
+
+    return slide, SlideHolders(slide, self._placeholder_positions[layout_name])
+
+  def reuse_slide(self, layout_name, blob):
+    """Append slide whose content is the xml of a slide saved earlier, e.g, in the previous build of the deck
+
+    Args:
+      layout_name (str): name of slide layout in template that the saved slide was created from
+      blob (bytes): slide xml, relating to nothing but its layout and notes slide
+
+    Returns:
+      pptx.slide.Slide: appended slide, without notes slide
+    """
+
+    layout = self._layouts[layout_name]
+    slide_part = SlidePart(self._allocate_partname(_SLIDE_PARTNAME), CT.PML_SLIDE, self._package, parse_xml(blob))
+    slide_part.relate_to(layout.part, RT.SLIDE_LAYOUT)
+    self._append_slide_part(slide_part)
+    slide = slide_part.slide
+    self.slides.append(slide)
+    return slide
+
+  def reorder_slides(self, slides):
+    """Put slides in the given order, as if they were created in that order
+
+    Slide ids, relationship ids and part names of slides and notes slides are reassigned in the new
+    order, so the saved deck is the same as one whose slides are created in that order.
+
+    Args:
+      slides (list of pptx.slide.Slide): all slides of the deck in their new order
+    """
+
+    rels = self._prs_part.rels
+    slide_rels = [rel for rel in rels.values() if rel.reltype == RT.SLIDE]
+    parts = [slide.part for slide in slides]
+    if len(parts) != len(slide_rels) or set(parts) != set(rel.target_part for rel in slide_rels):
+      raise ValueError("slides to reorder must be exactly the slides of the deck")
+
+    rIds = sorted((rel.rId for rel in slide_rels), key=_rId_number)
+    ids = sorted(sldId.id for sldId in self._sldIdLst.sldId_lst)
+    partnames = sorted((part.partname for part in parts), key=lambda p: _partname_number(_SLIDE_PARTNAME, p))
+    notes_parts = [part.part_related_by(RT.NOTES_SLIDE) for part in parts if part.has_notes_slide]
+    notes_partnames = sorted((part.partname for part in notes_parts), key=lambda p: _partname_number(_NOTES_SLIDE_PARTNAME, p))
+
+    for rId in rIds:
+      rels.pop(rId)
+    for sldId in self._sldIdLst.sldId_lst:
+      self._sldIdLst.remove(sldId)
+    for part, rId, id, partname in zip(parts, rIds, ids, partnames):
+      part.partname = partname
+      rels._rels[rId] = _Relationship(rels._base_uri, rId, RT.SLIDE, RTM.INTERNAL, part)
+      self._sldIdLst._add_sldId(id=id, rId=rId)
+    for part, partname in zip(notes_parts, notes_partnames):
+      part.partname = partname
+    self.slides = list(slides)
+
+  def set_notes(self, slide, text):
+    """Write speaker notes of slide according to :attr:`notes`
+
+    Args:
+      slide (pptx.slide.Slide): slide created by :meth:`add_slide`
+      text (str): notes text
+    """
+
+    if self._notes is False:
+      return
+    if self._notes == "lazy":
+      self._pending_notes.append((slide, text))
+      return
+    self._write_notes(slide, text)
+
+  def flush_notes(self):
+    """Create notes slides deferred by ``notes="lazy"``
+    """
+
+    position = {slide.part: index for index, slide in enumerate(self.slides)}
+    for slide, text in sorted(self._pending_notes, key=lambda e: position[e[0].part]):
+      self._write_notes(slide, text)
+    self._pending_notes = []
+
+  def _write_notes(self, slide, text):
+    """Write notes text, creating the notes slide as copy of the cached notes prototype if needed
+    """
+
+    slide_part = slide.part
+    if slide_part.has_notes_slide:
+      notes_slide = slide.notes_slide
+    else:
+      if self._notes_master_part is None:
+        self._notes_master_part = self._prs_part.notes_master_part
+      partname = self._allocate_partname(_NOTES_SLIDE_PARTNAME)
+      prototype = self._notes_prototype
+      element = CT_NotesSlide.new() if prototype is None else copy.deepcopy(prototype)
+      notes_part = NotesSlidePart(partname, CT.PML_NOTES_SLIDE, self._package, element)
+      notes_part.relate_to(self._notes_master_part, RT.NOTES_MASTER)
+      notes_part.relate_to(slide_part, RT.SLIDE)
+      notes_slide = notes_part.notes_slide
+      if prototype is None:
+        notes_slide.clone_master_placeholders(self._notes_master_part.notes_master)
+        self._notes_prototype = copy.deepcopy(notes_slide._element)
+      slide_part.relate_to(notes_part, RT.NOTES_SLIDE)
+    notes_slide.notes_text_frame.text = text
+
+  def prune_layouts(self):
+    """Remove slide layouts that no slide uses, with their media and other parts nothing else relates to
+
+    Slide masters and the notes master are kept, so the deck stays valid. Parts no longer related
+    from the presentation are left out when it is saved.
+
+    Returns:
+      int: deflated size of the pruned parts in bytes, as they would be stored in the pptx, also added to :attr:`pruned_bytes`
+
+    Raises:
+      ValueError: if the masters are shared with the template cache, i.e, :attr:`compact` was not set before adding slides
+    """
+
+    if self._shared:
+      raise ValueError("slide layouts shared with the template cache can not be pruned, set compact before adding slides")
+    before = set(self._package.iter_parts())
+    used = set()
+    for rel in self._prs_part.rels.values():
+      if rel.reltype == RT.SLIDE:
+        used.add(rel.target_part.part_related_by(RT.SLIDE_LAYOUT))
+
+    for master in self.prs.slide_masters:
+      sldLayoutIdLst = master._element.get_or_add_sldLayoutIdLst()
+      for sldLayoutId in list(sldLayoutIdLst.sldLayoutId_lst):
+        if master.part.related_part(sldLayoutId.rId) not in used:
+          sldLayoutIdLst.remove(sldLayoutId)
+          master.part.drop_rel(sldLayoutId.rId)
+
+    pruned = before - set(self._package.iter_parts())
+    size = sum(len(zlib.compress(part.blob)) for part in pruned)
+    self.pruned_bytes += size
+    return size
+
+  def save(self, destfile=None):
+    """Save presentation, creating deferred notes slides first
+
+    If :attr:`deterministic` is set, zip entries are written in name order with a fixed timestamp,
+    and a modified time missing from the template is fixed too, so the same content is saved as the
+    same bytes. The timestamp is ``SOURCE_DATE_EPOCH`` if it is set in the environment, otherwise
+    1980-01-01, the earliest zip timestamp. If :attr:`compact` is set, unused slide layouts are
+    pruned first.
+
+    Args:
+      destfile (str or file): pptx file path or writable binary file, None saves into memory
+
+    Returns:
+      io.BytesIO: pptx content, rewound, if ``destfile`` is None
+    """
+
+    self.flush_notes()
+    if self.compact:
+      self.prune_layouts()
+    return _save(self.prs, destfile, self.deterministic)
+
+  def save_preview(self, destfile, count):
+    """Save a copy of the deck holding only its first slides, e.g, to render preview images early
+
+    The deck itself is left unchanged, so it can still be saved in full.
+
+    Args:
+      destfile (str or file): pptx file path or writable binary file, None saves into memory
+      count (int): number of leading slides kept
+
+    Returns:
+      io.BytesIO: pptx content, rewound, if ``destfile`` is None
+    """
+
+    self.flush_notes()
+    if self.compact:
+      self.prune_layouts()
+    rels = self._prs_part.rels
+    all_rels = dict(rels._rels)
+    dropped = self._sldIdLst.sldId_lst[count:]
+    for sldId in dropped:
+      del rels._rels[sldId.rId]
+      self._sldIdLst.remove(sldId)
+    try:
+      return _save(self.prs, destfile, self.deterministic)
+    finally:
+      for sldId in dropped:
+        self._sldIdLst.append(sldId)
+      rels._rels.clear()
+      rels._rels.update(all_rels)
+
+
+def _save(prs, destfile, deterministic=False):
+  if deterministic:
+    return _save_deterministic(prs, destfile)
+  if destfile is not None:
+    prs.save(destfile)
+    return None
+  stream = io.BytesIO()
+  prs.save(stream)
+  stream.seek(0)
+  return stream
+
+def _save_deterministic(prs, destfile):
+  timestamp = _source_date()
+  package = prs.part.package
+  try:
+    package.part_related_by(RT.CORE_PROPERTIES)
+  except KeyError:
+    package.core_properties.modified = timestamp
+
+  saved = io.BytesIO()
+  prs.save(saved)
+  stream = io.BytesIO()
+  with zipfile.ZipFile(saved) as src, zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as dest:
+    names = sorted(src.namelist(), key=lambda name: (name != _CONTENT_TYPES, name))
+    for name in names:
+      info = zipfile.ZipInfo(name, timestamp.timetuple()[:6])
+      info.compress_type = zipfile.ZIP_DEFLATED
+      info.external_attr = 0o644 << 16
+      dest.writestr(info, src.read(name))
+
+  if destfile is None:
+    stream.seek(0)
+    return stream
+  if isinstance(destfile, str):
+    with open(destfile, "wb") as f:
+      f.write(stream.getvalue())
+  else:
+    destfile.write(stream.getvalue())
+  return None
+
+def _source_date():
+  """Timestamp of deterministic saves, ``SOURCE_DATE_EPOCH`` as in reproducible builds, or the earliest zip timestamp
+  """
+
+  epoch = os.environ.get("SOURCE_DATE_EPOCH")
+  if epoch is None:
+    return datetime.datetime(1980, 1, 1)
+  return max(datetime.datetime(1980, 1, 1), datetime.datetime.fromtimestamp(int(epoch), datetime.timezone.utc).replace(tzinfo=None))
+
+_CONTENT_TYPES = "[Content_Types].xml"
+
+_SLIDE_PARTNAME = "/ppt/slides/slide%d.xml"
+_NOTES_SLIDE_PARTNAME = "/ppt/notesSlides/notesSlide%d.xml"
+
+def _partname_number(tmpl, partname):
+  prefix, suffix = tmpl.split("%d")
+  number = partname[len(prefix):-len(suffix)]
+  if partname.startswith(prefix) and partname.endswith(suffix) and number.isdigit():
+    return int(number)
+  return None
+
+def _rId_number(rId):
+  return int(rId[3:]) if rId.startswith("rId") and rId[3:].isdigit() else 0
@@ -6,7 +6,7 @@ class EnglishPhrasePPT(PhrasePPT):
   """Create Phrase PPT for English study
 
   Attributes:
-    content (list of dict): read from csv file
+    content (iterator of dict): read from csv file one record at a time
   """
 
   _template_dir = os.path.dirname(__file__)
@@ -25,9 +25,7 @@ class EnglishPhrasePPT(PhrasePPT):
     ps_obj = json.loads(line["noun_phrases"])[:4]
     vs_obj = json.loads(line["verbs"])[:4]
 
-    layout = self._prs.slide_layouts.get_by_name("Phrase and verb")
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide("Phrase and verb")
   
     st_holder, sm_holder = holders[10], holders[11]
     st_holder.text_frame.text = sentence_obj["text"]
@@ -6,7 +6,7 @@ class SpanishStructureKGPPT(StructureKGPPT):
   """Create StructureKG PPT for English study
 
   Attributes:
-    content (list of dict): read from csv file
+    content (iterator of dict): read from json file one record at a time
   """
 
   _template_dir = os.path.dirname(__file__)
@@ -25,9 +25,7 @@ class SpanishStructureKGPPT(StructureKGPPT):
     structure_str = line["structure_rep"]
     structure_obj = line["structure"]
 
-    layout = self._prs.slide_layouts.get_by_name("Structure")
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide("Structure")
   
     original_holder, translated_holder, structure_holder = holders[10], holders[11], holders[12]
     original_holder.text_frame.text = sentence_obj["text"]
@@ -43,9 +41,7 @@ class SpanishStructureKGPPT(StructureKGPPT):
     sentence_obj = line["sentence"]
     kg_obj = line["kg"]
 
-    layout = self._prs.slide_layouts.get_by_name("Detail")
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide("Detail")
   
     original_holder, translated_holder = holders[10], holders[11]
     original_holder.text_frame.text = sentence_obj["text"]
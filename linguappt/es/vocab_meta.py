@@ -1,12 +1,21 @@
 class SpanishVocabMeta:
   @classmethod
   def get_pos(cls, dict_pos):
-    _pos = 'other'
-    for pos, des in cls.pos_info.items():
-      if dict_pos in des[2]:
-        _pos = pos
-        break
-    return _pos 
+    return cls._pos_index.get(dict_pos, 'other')
+
+  @classmethod
+  def get_poses(cls, dict_poses):
+    """Classify a whole column of dictionary PoS tags in one pass
+
+    Args:
+      dict_poses (iterable of str): PoS tags from dictionary, e.g, ``n.``, ``vt.vi.``
+
+    Returns:
+      list of str: PoS of each tag, ``other`` for unknown tags
+    """
+
+    get = cls._pos_index.get
+    return [get(tag, 'other') for tag in dict_poses]
   
   @classmethod
   def get_pos_name(cls, pos):
@@ -26,6 +35,10 @@ class SpanishVocabMeta:
     'other': ('其他', 'los otros', [])
   }
 
+  # reverse lookup from dictionary tag to PoS, the first PoS listing a tag wins, unknown tags fall
+  # back to 'other' through dict.get and are never added
+  _pos_index = {tag: pos for pos, des in reversed(list(pos_info.items())) for tag in des[2]}
+
   tense_info = {
     'imperativo_afirmativo': "命令式-肯定",
     'imperativo_negativo': "命令式-否定",
@@ -1,14 +1,13 @@
 from linguappt.vocab_ppt import VocabPPT
 from linguappt.es.vocab_meta import SpanishVocabMeta
 import os
-import json
 
 class SpanishVocabPPT(VocabPPT):
   """Create Vocabulary PPT for Spanish study
 
   Attributes:
-    content (list of dict): read from csv file
-    word_distrubtion (dict): key is PoS, e.g, ``noun``, ``verb``, ``daj``, value is list of vocabularies
+    content (iterator of VocabRecord): read from csv file one record at a time
+    pos_counts (dict): key is PoS, e.g, ``noun``, ``verb``, ``adj``, value is number of vocabularies, filled by ``convert_to_ppt``
   """
 
   _template_dir = os.path.dirname(__file__)
@@ -27,19 +26,15 @@ class SpanishVocabPPT(VocabPPT):
     super().__init__(sourcefile, title, genre)
 
   def _create_noun_with_extension_A(self, v):
-    layout = self._prs.slide_layouts.get_by_name("Noun with extension A")
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide("Noun with extension A")
 
-    pos = v["dict_pos"]
+    pos = v.dict_pos
 
     pos_holder = holders[10]
     pos_holder.text_frame.text = pos 
     noun, meaning = holders[11], holders[12]
-    noun.text_frame.text = v["word"]
-    ms = v["meaning"].split(",")
-    if len(ms) > 4:
-      ms = ms[:4]
+    noun.text_frame.text = v.word
+    ms = v.meanings[:4]
     meaning.text_frame.text = "\n".join(ms) 
 
 
@@ -55,75 +50,65 @@ class SpanishVocabPPT(VocabPPT):
     pl_def.text_frame.text = arts[2]
     pl_undef.text_frame.text = arts[3]
 
-    extension = json.loads(v["extension"])
+    extension = v.extension
     if "pl." in pos:
-      s, pl = extension[arts[4]], v["word"]
+      s, pl = extension[arts[4]], v.word
     else:
-      s, pl = v["word"], extension[arts[4]]     
+      s, pl = v.word, extension[arts[4]]     
 
     holders[14].text_frame.text = s
     holders[16].text_frame.text = s
     holders[18].text_frame.text = pl 
     holders[20].text_frame.text = pl 
 
-    note = slide.notes_slide
-    note.notes_text_frame.text = v["word"]
+    self._set_notes(slide, v.word)
 
   def _create_noun(self, v):
-    if v["extension"] != "":
+    if v.extension is not None:
       self._create_noun_with_extension_A(v)
     else:
       self._create_default_word(v)
 
   def _create_adj_with_extension_A(self, v):
-    layout = self._prs.slide_layouts.get_by_name("Adj with extension A")
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide("Adj with extension A")
 
     pos_holder = holders[10]
     adj, meaning = holders[11], holders[12]
-    adj.text_frame.text = v["word"]
-    ms = v["meaning"].split(",")
-    if len(ms) > 4:
-      ms = ms[:4]
+    adj.text_frame.text = v.word
+    ms = v.meanings[:4]
 
     meaning.text_frame.text = "\n".join(ms)
 
     s_m, s_f, pl_m, pl_f = holders[13], holders[14], holders[15], holders[16]
 
-    extension = json.loads(v["extension"])
+    extension = v.extension
 
     s_m.text_frame.text = extension["m"]
     s_f.text_frame.text = extension["f"]
     pl_m.text_frame.text = extension["mpl"]
     pl_f.text_frame.text = extension["fpl"]
 
-    note = slide.notes_slide
-    note.notes_text_frame.text = v["word"]
+    self._set_notes(slide, v.word)
 
   def _create_adj(self, v):
-    if v["extension"] != "":
+    if v.extension is not None:
       self._create_adj_with_extension_A(v)
     else:
       self._create_default_word(v)
 
   def _create_verb_with_extension_A(self, v):
-    layout = self._prs.slide_layouts.get_by_name("Verb with extension A")
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide("Verb with extension A")
     
-    variations = json.loads(v["variations"])
+    variations = v.variations
 
     pos_holder = holders[10]
-    pos_holder.text_frame.text = v["dict_pos"]
+    pos_holder.text_frame.text = v.dict_pos
 
     original, word, meaning = holders[11], holders[12], holders[13]
     original.text_frame.text = variations["original"]
-    word.text_frame.text = v["word"]
+    word.text_frame.text = v.word
 
-    ms = v["meaning"].split(",")
-    if len(ms) > 4:
-      ms = ms[:4]
+    ms = v.meanings[:4]
 
     meaning.text_frame.text = "\n".join(ms)
 
@@ -131,7 +116,7 @@ class SpanishVocabPPT(VocabPPT):
     tense = sign["tense"]
     person = sign["person"]
 
-    extension = json.loads(v["extension"])[tense]
+    extension = v.extension[tense]
 
     holders[14].text_frame.text = extension["yo"] if extension["yo"] != "" else " "
     holders[15].text_frame.text = extension["tú"]
@@ -143,27 +128,22 @@ class SpanishVocabPPT(VocabPPT):
     holders[20].text_frame.text = self.__class__._metainfo.tense_info[tense]
     holders[21].text_frame.text = " ".join(["人称", person, "的变位"])
 
-    note = slide.notes_slide
-    note.notes_text_frame.text = v["word"]
+    self._set_notes(slide, v.word)
 
 
   def _create_verb_with_extension_B(self, v):
-    layout = self._prs.slide_layouts.get_by_name("Verb with extension B")
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide("Verb with extension B")
     
-    variations = json.loads(v["variations"])
+    variations = v.variations
 
     pos_holder = holders[10]
-    pos_holder.text_frame.text = v["dict_pos"]
+    pos_holder.text_frame.text = v.dict_pos
 
     original, word, meaning = holders[11], holders[12], holders[13]
     original.text_frame.text = variations["original"]
-    word.text_frame.text = v["word"]
+    word.text_frame.text = v.word
 
-    ms = v["meaning"].split(",")
-    if len(ms) > 4:
-      ms = ms[:4]
+    ms = v.meanings[:4]
 
     meaning.text_frame.text = "\n".join(ms)
  
@@ -171,25 +151,20 @@ class SpanishVocabPPT(VocabPPT):
     holders[14].text_frame.text = "\n".join([self.__class__._metainfo.tense_info[f["tense"]] if "tense" in f.keys() else self.__class__._metainfo.tense_info[f["format"]] for f in formats])
     holders[15].text_frame.text = "\n".join([" ".join([f["person"], "的变位"]) if "person" in f.keys() else "" for f in formats])
 
-    note = slide.notes_slide
-    note.notes_text_frame.text = v["word"]
+    self._set_notes(slide, v.word)
 
   def _create_verb_with_extension_C(self, v):
-    layout = self._prs.slide_layouts.get_by_name("Verb with extension C")
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide("Verb with extension C")
     
-    variations = json.loads(v["variations"])
+    variations = v.variations
 
     pos_holder = holders[10]
-    pos_holder.text_frame.text = v["dict_pos"]
+    pos_holder.text_frame.text = v.dict_pos
     original, word, meaning = holders[11], holders[12], holders[13]
     original.text_frame.text = variations["original"]
-    word.text_frame.text = v["word"]
+    word.text_frame.text = v.word
 
-    ms = v["meaning"].split(",")
-    if len(ms) > 4:
-      ms = ms[:4]
+    ms = v.meanings[:4]
 
     meaning.text_frame.text = "\n".join(ms)
  
@@ -197,14 +172,13 @@ class SpanishVocabPPT(VocabPPT):
 
     holders[14].text_frame.text = self.__class__._metainfo.tense_info[sign["format"]]
 
-    note = slide.notes_slide
-    note.notes_text_frame.text = v["word"]
+    self._set_notes(slide, v.word)
 
   def _create_verb(self, v):
-    if v["variations"] == "":
+    if v.variations is None:
       self._create_default_word(v)
     else:
-      variations = json.loads(v["variations"])
+      variations = v.variations
       if "formats" in variations.keys():
         formats = variations["formats"]
         if len(formats) > 1:
@@ -1,9 +1,18 @@
-from pdf2image import convert_from_path
-from subprocess import call, DEVNULL
+from subprocess import call, run, Popen, DEVNULL, TimeoutExpired
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from linguappt.office import active_office_pool
+import multiprocessing.util
 import os
 import csv
 import sys
 import json
+import itertools
+import re
+import shutil
+import tempfile
+import threading
+import time
 
 def read_json(jsonfile):
   data = []
@@ -11,6 +20,103 @@ def read_json(jsonfile):
     data = json.load(f)
   return data
 
+def iter_json(filename, chunk_size=65536):
+  """Read json file record by record, with memory bounded by the largest record
+
+  The file is either a top-level array, which is parsed incrementally, or JSON Lines, one
+  record per line. The format is detected from the first non-blank character.
+
+  Args:
+    filename (str): json or json lines file name
+    chunk_size (int): number of characters read from the file at a time
+
+  Yields:
+    object: record in json file, e.g, dict
+
+  Raises:
+    ValueError: if the file is not valid json or json lines
+  """
+  if not os.path.isfile(filename):
+    print("{} DOES NOT exist!!!".format(filename), file=sys.stderr)
+    return
+  with open(filename) as f:
+    head = f.read(chunk_size)
+    while head.strip() == "":
+      chunk = f.read(chunk_size)
+      if chunk == "":
+        return
+      head += chunk
+    if head.lstrip().startswith("["):
+      yield from _iter_json_array(f, head, chunk_size)
+    else:
+      yield from _iter_json_lines(f, head)
+
+def _iter_json_lines(f, head):
+  lines = (head + f.readline()).split("\n")
+  for line in itertools.chain(lines, f):
+    if line.strip() != "":
+      yield json.loads(line)
+
+def _iter_json_array(f, buf, chunk_size):
+  decoder = json.JSONDecoder()
+  pos = buf.index("[") + 1
+  eof = False
+
+  def skip_whitespace(buf, pos, eof):
+    while True:
+      pos = _WHITESPACE.match(buf, pos).end()
+      if pos < len(buf) or eof:
+        return buf, pos, eof
+      chunk = f.read(chunk_size)
+      buf, pos, eof = buf[pos:] + chunk, 0, chunk == ""
+
+  buf, pos, eof = skip_whitespace(buf, pos, eof)
+  if buf[pos:pos+1] == "]":
+    return
+  while True:
+    try:
+      record, end = decoder.raw_decode(buf, pos)
+      complete = end < len(buf) or eof
+    except ValueError:
+      if eof:
+        raise
+      complete = False
+    if not complete:
+      chunk = f.read(chunk_size)
+      buf, pos, eof = buf[pos:] + chunk, 0, chunk == ""
+      continue
+    yield record
+
+    buf, pos, eof = skip_whitespace(buf, end, eof)
+    sep = buf[pos:pos+1]
+    if sep == "]":
+      return
+    if sep != ",":
+      raise ValueError("expected ',' or ']' after record, got {!r}".format(sep))
+    buf, pos, eof = skip_whitespace(buf[pos+1:], 0, eof)
+
+_WHITESPACE = re.compile(r"\s*")
+
+def iter_csv(filename):
+  """Read csv file record by record
+
+  Args:
+    filename (str): csv file name
+
+  Yields:
+    dict: record in csv file, key is column name in header
+  """
+  if not os.path.isfile(filename):
+    print("{} DOES NOT exist!!!".format(filename), file=sys.stderr)
+    return
+  with open(filename) as csvfile:
+    cursor = csv.reader(csvfile, skipinitialspace=True, delimiter='\t')
+    header = next(cursor, None)
+    if header is None:
+      return
+    for row in cursor:
+      yield dict(zip(header, row))
+
 def readCSV(filename):
   """Read csv file
   
@@ -20,47 +126,315 @@ def readCSV(filename):
   Returns:
     list of dict: records in csv file
   """
-  if not os.path.isfile(filename):
-    print("{} DOES NOT exist!!!".format(filename), file=sys.stderr)
-    return []
-  with open(filename) as csvfile:
-    cursor = csv.reader(csvfile, skipinitialspace=True, delimiter='\t')
-    header = next(cursor)
-    return [dict(zip(header, row)) for row in cursor]
+  return list(iter_csv(filename))
+
+def memory_tempdir():
+  """Create temporary directory on memory backed tmpfs if it is available, e.g, ``/dev/shm``
+
+  Returns:
+    tempfile.TemporaryDirectory: directory removed on exit of ``with`` block
+  """
+  shm = "/dev/shm"
+  tmpfs = shm if os.path.isdir(shm) and os.access(shm, os.W_OK) else None
+  return tempfile.TemporaryDirectory(prefix="linguappt_", dir=tmpfs)
+
+def _content(data):
+  if isinstance(data, (bytes, bytearray, memoryview)):
+    return data
+  if hasattr(data, "getvalue"):
+    return data.getvalue()
+  return data.read()
 
 def pptx2pdf(pptx, pdffolder='./'):
   """Convert pptx into pdf
 
   Args:
-    pptx (str): pptx file
-    pdffile (str): folder that the pdf is stored in
+    pptx (str or bytes or file): pptx file, or pptx content as bytes or readable binary file
+    pdffile (str): folder that the pdf is stored in, ignored if ``pptx`` is content
 
   Returns:
-    str: pdf file path 
+    str or bytes: pdf file path, or pdf content if ``pptx`` is content
+
+  Note:
+    Warm office instances are used if an office pool is enabled by ``linguappt.office.enable_office_pool``.
+    Otherwise office runs with a profile of this process that no other running conversion uses, so
+    concurrent conversions do not collide, see :func:`_acquire_profile`.
+    Content is handed to office through a memory backed temporary directory.
   """
+  if not isinstance(pptx, str):
+    with memory_tempdir() as tmp:
+      pptxpath = os.path.join(tmp, "deck.pptx")
+      with open(pptxpath, "wb") as f:
+        f.write(_content(pptx))
+      with open(pptx2pdf(pptxpath, tmp), "rb") as f:
+        return f.read()
+  pool = active_office_pool()
+  if pool is not None:
+    return pool.convert(pptx, pdffolder)
   if not os.path.isdir(pdffolder):
     os.mkdir(pdffolder) 
-  call(['soffice', '--headless', '--convert-to', 'pdf', '--outdir', pdffolder, pptx], stdout=DEVNULL)
+  profile = _acquire_profile()
+  try:
+    call(_soffice_command([pptx], pdffolder, profile), stdout=DEVNULL)
+  finally:
+    _release_profile(profile)
   pdfpath = os.path.join(pdffolder, os.path.basename(pptx).split('.')[0] + '.pdf')
   return pdfpath
 
-def pdf2images(pdfpath, imgfolder='./', start=0, end=None):
-  """Convert pdf into images
+def pptx2pdf_async(pptx, pdffolder='./'):
+  """Start converting pptx into pdf without waiting for the pdf
+
+  Without an office pool, office runs in its own session with a profile of this process, which is
+  not used by other conversions until office exits, and finishes even if this process exits.
+
+  Args:
+    pptx (str): pptx file
+    pdffolder (str): folder that the pdf is stored in
+
+  Returns:
+    tuple: ``(pdfpath, wait)``, calling ``wait()`` blocks until the pdf is written
+  """
+  pdfpath = os.path.join(pdffolder, os.path.basename(pptx).split('.')[0] + '.pdf')
+  if active_office_pool() is not None:
+    job = threading.Thread(target=pptx2pdf, args=(pptx, pdffolder))
+    job.start()
+    return pdfpath, job.join
+  if not os.path.isdir(pdffolder):
+    os.mkdir(pdffolder)
+  profile = _acquire_profile()
+  process = Popen(_soffice_command([pptx], pdffolder, profile), stdout=DEVNULL, stderr=DEVNULL, start_new_session=True)
+
+  def finish():
+    process.wait()
+    _release_profile(profile)
+
+  watcher = threading.Thread(target=finish, daemon=True)
+  watcher.start()
+
+  def wait():
+    watcher.join()
+    return process.returncode
+
+  return pdfpath, wait
+
+class PdfConversionError(RuntimeError):
+  """Office did not write the pdf of some pptx files
+
+  Attributes:
+    missing (dict): key is pptx file, value is the expected pdf path which does not exist
+  """
+
+  def __init__(self, missing):
+    self.missing = missing
+    lines = ["  {} -> {}".format(pptx, pdf) for pptx, pdf in missing.items()]
+    super().__init__("\n".join(["{} pptx files were not converted".format(len(missing))] + lines))
+
+def _soffice_command(pptx_paths, pdffolder, profile, soffice="soffice"):
+  """Build office command converting pptx files into pdf, with its own user profile directory
+  """
+  return [soffice, "-env:UserInstallation=file://" + os.path.abspath(profile), '--headless', '--convert-to', 'pdf', '--outdir', pdffolder] + list(pptx_paths)
+
+_profiles = {"pid": None, "free": []}
+_profiles_lock = threading.Lock()
+
+def _acquire_profile():
+  """Take an office profile directory of this process that no running conversion uses, creating one if all are busy
+
+  Profiles are reused by later conversions, so office initializes a profile only once, and removed
+  when the process exits, except profiles of office processes still running. A forked process
+  starts with no profiles of its own.
+  """
+  with _profiles_lock:
+    if _profiles["pid"] != os.getpid():
+      _profiles.update(pid=os.getpid(), free=[])
+      multiprocessing.util.Finalize(None, _remove_profiles, exitpriority=0)
+    if len(_profiles["free"]) > 0:
+      return _profiles["free"].pop()
+  return tempfile.mkdtemp(prefix="linguappt_profile_{}_".format(os.getpid()))
+
+def _release_profile(profile):
+  with _profiles_lock:
+    if _profiles["pid"] == os.getpid():
+      _profiles["free"].append(profile)
+
+def _remove_profiles():
+  with _profiles_lock:
+    if _profiles["pid"] != os.getpid():
+      return
+    for profile in _profiles["free"]:
+      shutil.rmtree(profile, ignore_errors=True)
+    _profiles["free"] = []
+
+def _convert_chunk(pptx_paths, pdffolder, soffice, timeout):
+  profile = _acquire_profile()
+  cmd = _soffice_command(pptx_paths, pdffolder, profile, soffice)
+  try:
+    run(cmd, stdout=DEVNULL, stderr=DEVNULL, timeout=timeout)
+  except TimeoutExpired:
+    pass # pdfs not written in time are reported as missing
+  finally:
+    _release_profile(profile)
+
+def pptx2pdf_many(pptx_paths, pdffolder='./', chunk_size=20, processes=None, soffice="soffice", timeout=600):
+  """Convert many pptx into pdf, each chunk of files by a single office process
+
+  Chunks are converted in parallel, every running office process has its own profile.
+
+  Args:
+    pptx_paths (list of str): pptx files, their base names must be distinct
+    pdffolder (str): folder that the pdfs are stored in
+    chunk_size (int): number of pptx files converted by one office process
+    processes (int): number of office processes running at the same time, default is the number of cpus
+    soffice (str): office executable
+    timeout (int): seconds one chunk may take
+
+  Returns:
+    list of str: pdf file paths, in the order of ``pptx_paths``
+
+  Raises:
+    ValueError: if two pptx files would be converted into the same pdf
+    PdfConversionError: if the pdf of any pptx file is missing after conversion
+  """
+  if not os.path.isdir(pdffolder):
+    os.mkdir(pdffolder)
+  pdfpaths = [os.path.join(pdffolder, os.path.splitext(os.path.basename(pptx))[0] + '.pdf') for pptx in pptx_paths]
+  if len(set(pdfpaths)) != len(pdfpaths):
+    raise ValueError("pptx files with the same name can not be converted into the same folder")
+
+  started = time.time()
+  chunks = [pptx_paths[i:i+chunk_size] for i in range(0, len(pptx_paths), chunk_size)]
+  with ThreadPoolExecutor(max_workers=processes or os.cpu_count()) as pool:
+    list(pool.map(lambda chunk: _convert_chunk(chunk, pdffolder, soffice, timeout), chunks))
+
+  missing = {pptx: pdf for pptx, pdf in zip(pptx_paths, pdfpaths) if not os.path.isfile(pdf) or os.path.getmtime(pdf) < started - 1}
+  if len(missing) > 0:
+    raise PdfConversionError(missing)
+  return pdfpaths
+
+def iter_pdf_pages(pdfpath, start=0, end=None, chunk_pages=8, size=(800, None), thread_count=None):
+  """Rasterize pdf pages in range, a chunk of pages at a time
+
+  Only the images of one chunk are kept in memory, each image is released once it is consumed.
 
   Args:
     pdfpath (str): pdf file path
+    start (int): start page of pdf, counting from 0
+    end (int): end page of pdf, excluded, None is the last page
+    chunk_pages (int): number of pages rasterized by one rasterizer run, None rasterizes the whole range at once
+    size (tuple): image size passed to the rasterizer, None keeps the size of pdf page at 200 dpi
+    thread_count (int): number of rasterizer processes per chunk, default is the number of available cpus
+
+  Yields:
+    PIL.Image.Image: image of each page in range
+  """
+  from pdf2image import convert_from_path, pdfinfo_from_path
+  pages = None
+  if start < 0 or (end is not None and end < 0) or (end is None and chunk_pages is not None):
+    pages = pdfinfo_from_path(pdfpath, timeout=240)["Pages"]
+  first_page, last_page = _page_range(start, end, pages)
+  if last_page is not None and first_page > last_page:
+    return
+  thread_count = thread_count or _cpu_count()
+  for chunk_first, chunk_last in _page_chunks(first_page, last_page, chunk_pages):
+    images = convert_from_path(pdfpath, first_page=chunk_first, last_page=chunk_last, thread_count=thread_count, use_pdftocairo=True, size=size, timeout=240)
+    images.reverse()
+    while len(images) > 0:
+      yield images.pop()
+
+IMAGE_FORMATS = {"jpg": "JPEG", "jpeg": "JPEG", "png": "PNG", "webp": "WEBP"}
+"""Image formats of :func:`pdf2images`, key is file extension, value is PIL format name
+"""
+
+def pdf2images(pdfpath, imgfolder='./', start=0, end=None, chunk_pages=8, fmt="jpg", quality=None, widths=None, workers=None, indexes=None):
+  """Convert pdf into images
+
+  Pages are rasterized once, resizing and encoding run on a thread pool.
+
+  Args:
+    pdfpath (str or bytes or file): pdf file path, or pdf content as bytes or readable binary file
     imgfolder (str): image folder. Default is current folder
-    start (int): start page of pdf
-    end (int): end page pdf
+    start (int): start page of pdf, counting from 0
+    end (int): end page of pdf, excluded, None is the last page. Only pages in range are rasterized
+    chunk_pages (int): number of pages rasterized at a time, None rasterizes all pages in range at once
+    fmt (str): image format, one of :data:`IMAGE_FORMATS`
+    quality (int): encoder quality of jpg and webp, default is the PIL default
+    widths (list of int): image widths, None in the list keeps the rasterized size. Every width is
+      stored in its own sub folder, named after the width or ``full``. Default is one 800 pixel
+      wide image per page stored in ``imgfolder``
+    workers (int): number of encoding threads, default is the number of available cpus
+    indexes (list of int): image file numbers of the pages in range, e.g, the slide numbers of a
+      sub-deck, default numbers images from 0
 
   Returns:
-    int: number of images stored
+    int: number of pages converted
   """
+  if fmt not in IMAGE_FORMATS:
+    raise ValueError("unknown image format {}, expected one of {}".format(fmt, ", ".join(IMAGE_FORMATS)))
+  if not isinstance(pdfpath, str):
+    with memory_tempdir() as tmp:
+      path = os.path.join(tmp, "deck.pdf")
+      with open(path, "wb") as f:
+        f.write(_content(pdfpath))
+      return pdf2images(path, imgfolder, start, end, chunk_pages, fmt, quality, widths, workers, indexes)
   if not os.path.isdir(imgfolder):
     os.mkdir(imgfolder) 
-  images = convert_from_path(pdfpath, thread_count=2, use_pdftocairo=True, size=(800, None), timeout=240)
-  for index, image in enumerate(images[start:end]):
-    image.save(os.path.join(imgfolder, str(index)+".jpg"))
-  return len(images[start:end])
+
+  if widths is None:
+    size = (800, None)
+    folders = {None: imgfolder}
+  else:
+    size = None if None in widths else (max(widths), None)
+    folders = {w: os.path.join(imgfolder, "full" if w is None else str(w)) for w in widths}
+    for folder in folders.values():
+      if not os.path.isdir(folder):
+        os.mkdir(folder)
+
+  def encode(index, image):
+    for width, folder in folders.items():
+      _resize(image, width).save(os.path.join(folder, "{}.{}".format(index, fmt)), IMAGE_FORMATS[fmt], **options)
+
+  options = {} if quality is None or fmt == "png" else {"quality": quality}
+  workers = workers or _cpu_count()
+  count = 0
+  with ThreadPoolExecutor(max_workers=workers) as pool:
+    pending = deque()
+    for index, image in enumerate(iter_pdf_pages(pdfpath, start, end, chunk_pages, size)):
+      pending.append(pool.submit(encode, index if indexes is None else indexes[index], image))
+      while len(pending) > 2 * workers:
+        pending.popleft().result()
+      count += 1
+    for future in pending:
+      future.result()
+  return count
+
+def _resize(image, width):
+  if width is None or image.width <= width:
+    return image
+  from PIL import Image
+  return image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+
+def _cpu_count():
+  if hasattr(os, "sched_getaffinity"):
+    return len(os.sched_getaffinity(0))
+  return os.cpu_count() or 1
+
+def _page_chunks(first_page, last_page, chunk_pages):
+  if chunk_pages is None:
+    return [(first_page, last_page)]
+  return [(p, min(p + chunk_pages - 1, last_page)) for p in range(first_page, last_page + 1, chunk_pages)]
+
+def _page_range(start, end, pages=None):
+  """Translate python slice bounds of 0-based pages into 1-based inclusive pdf page numbers
+
+  Args:
+    start (int): start page, negative counts from the end
+    end (int): end page, excluded, None is the last page, negative counts from the end
+    pages (int): number of pages in pdf, required only if ``start`` or ``end`` is negative
+
+  Returns:
+    tuple: ``(first_page, last_page)``, ``last_page`` is None for the last page of pdf
+  """
+  first, last, _ = slice(start, end).indices(pages) if pages is not None else (start, end, 1)
+  return first + 1, last
 
 
@@ -0,0 +1,148 @@
+from linguappt.batch import ppt_class
+from linguappt.lib import pptx2pdf, pptx2pdf_async, pdf2images
+from linguappt.media_cache import MediaCache
+import os
+import shutil
+
+DEFAULT_TITLE = "歧舌AI备课助教"
+
+PREVIEW_SLIDES = 6
+"""Number of leading slides rendered as preview images, e.g, opening, statistics and first contents
+"""
+
+
+def _persist(content, folder, filename):
+  """Write content into folder if the folder is asked for
+
+  Returns:
+    str: file path, None if ``folder`` is None
+  """
+
+  if folder is None:
+    return None
+  if not os.path.isdir(folder):
+    os.mkdir(folder)
+  path = folder + "/" + filename
+  with open(path, "wb") as f:
+    f.write(content)
+  return path
+
+
+def _restore(entry, name, pptxdir, pdfdir, imgdir):
+  """Copy cached outputs into the directories asked for
+  """
+
+  for folder, filename, cached in ((pptxdir, name + '.pptx', "deck.pptx"), (pdfdir, name + '.pdf', "deck.pdf")):
+    if folder is not None:
+      os.makedirs(folder, exist_ok=True)
+      shutil.copyfile(os.path.join(entry["path"], cached), os.path.join(folder, filename))
+  os.makedirs(imgdir, exist_ok=True)
+  for image in entry["images"]:
+    shutil.copyfile(os.path.join(entry["path"], "images", image), os.path.join(imgdir, image))
+
+
+def _images(imgdir, images_len):
+  return [os.path.join(imgdir, "{}.jpg".format(i)) for i in range(images_len)]
+
+
+def meta2media(ptype, sourcemeta, lang, name, pptxdir, pdfdir, imgdir, title=DEFAULT_TITLE, preview=False, background=False, cache=None, compact=False, notes=True):
+  """Convert source meta file into pptx, pdf and preview images, reporting progress as phase events
+
+  The pptx and pdf are passed from step to step in memory, they are written only into the
+  directories asked for. In preview mode, a sub-deck holding only the preview slides is converted
+  first, so preview images are ready before the full pdf is. The sub-deck and its pdf are never
+  written out.
+
+  With a cache, outputs are looked up by a hash of the source file, arguments, templates and
+  package version. On a hit they are copied from the cache, skipping ppt, pdf and image generation,
+  and step 4 follows step 1 directly, in preview mode followed by step 6 if the pdf is asked for.
+  Step 4 reports the cache status and counters. Preview images are cached before step 4, so they
+  are cached even if the full pdf is never waited for.
+
+  Args:
+    ptype (str): ppt type, ``VOCAB``, ``PHRASE`` or ``SKG``
+    sourcemeta (str): source csv or json file
+    lang (str): language, e.g, ``en``
+    name (str): file name of pptx and pdf, without extension
+    pptxdir (str): pptx destination directory, None does not keep the pptx
+    pdfdir (str): pdf destination directory, None does not keep the pdf
+    imgdir (str): preview image destination directory
+    title (str): title shown in ppt
+    preview (bool): render preview images from the preview sub-deck before the full pdf
+    background (bool): in preview mode, start the full pdf conversion without waiting for it, ``pptxdir`` and ``pdfdir`` are required
+    cache (MediaCache or str): output cache, or its directory, default is no caching
+    compact (bool): leave unused slide layouts and their media out of the pptx, so it is smaller to store and to convert
+    notes (bool or str): speaker notes mode of vocabulary decks, one of ``linguappt.deck.NOTES``, e.g, False for preview jobs never showing notes
+
+  Yields:
+    dict: phase event, ``{"step": ..., "msg": ...}``
+  """
+
+  _PPT = ppt_class(ptype, lang)
+  if background and (pptxdir is None or pdfdir is None):
+    raise ValueError("background pdf generation needs pptxdir and pdfdir")
+  if isinstance(cache, str):
+    cache = MediaCache(cache)
+  yield {"step": 1, "msg": "Start ppt generation"}
+
+  if cache is not None:
+    key = cache.key(ptype, lang, sourcemeta, title, _PPT, {"preview_slides": PREVIEW_SLIDES, "compact": compact, "notes": notes})
+    require = [output for output, folder in (("pptx", pptxdir), ("pdf", pdfdir)) if folder is not None]
+    entry = cache.get(key, require, lambda entry: _restore(entry, name, pptxdir, pdfdir, imgdir))
+    if entry is not None:
+      yield {"step": 4, "msg": "Finish images generation", "images_len": len(entry["images"]), "cache": dict(cache.stats(), status="hit")}
+      if preview and pdfdir is not None:
+        yield {"step": 6, "msg": "Finish pdf generation", "pdf": os.path.join(pdfdir, name + '.pdf')}
+      return
+    cached = {"cache": dict(cache.stats(), status="miss")}
+  else:
+    cached = {}
+
+  vp = _PPT(sourcemeta, title)
+  options = {"notes": notes} if ptype == "VOCAB" else {}
+  pptx = vp.convert_to_ppt(None, compact=compact, **options).getvalue()
+  pptxpath = _persist(pptx, pptxdir, name + '.pptx')
+
+  if not preview:
+    yield {"step": 2, "msg": "Finish ppt generation, start pdf generation"}
+
+    pdf = pptx2pdf(pptx)
+    _persist(pdf, pdfdir, name + '.pdf')
+
+    yield {"step": 3, "msg": "Finish pdf generation, start images generation"}
+
+    images_len = pdf2images(pdf, imgdir, 0, PREVIEW_SLIDES)
+    if cache is not None:
+      cache.put(key, pptx, pdf, _images(imgdir, images_len))
+
+    yield {"step": 4, "msg": "Finish images generation", "images_len": images_len, **cached}
+    return
+
+  preview_pptx = vp.save_preview(None, PREVIEW_SLIDES).getvalue()
+
+  yield {"step": 2, "msg": "Finish ppt generation, start preview pdf generation"}
+
+  preview_pdf = pptx2pdf(preview_pptx)
+
+  yield {"step": 3, "msg": "Finish preview pdf generation, start images generation"}
+
+  images_len = pdf2images(preview_pdf, imgdir, 0, PREVIEW_SLIDES)
+  if cache is not None:
+    cache.put(key, pptx, None, _images(imgdir, images_len))
+
+  yield {"step": 4, "msg": "Finish images generation", "images_len": images_len, **cached}
+
+  if pdfdir is None or background:
+    if pdfdir is not None:
+      pdfpath, _ = pptx2pdf_async(pptxpath, pdfdir)
+      yield {"step": 5, "msg": "Start pdf generation in background", "pdf": pdfpath}
+    return
+
+  yield {"step": 5, "msg": "Start pdf generation"}
+
+  pdf = pptx2pdf(pptx)
+  pdfpath = _persist(pdf, pdfdir, name + '.pdf')
+  if cache is not None:
+    cache.put(key, pptx, pdf, _images(imgdir, images_len))
+
+  yield {"step": 6, "msg": "Finish pdf generation", "pdf": pdfpath}
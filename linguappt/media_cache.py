@@ -0,0 +1,204 @@
+from linguappt import __version__
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+
+class MediaCache:
+  """On-disk cache of pptx, pdf and preview images, addressed by a hash of everything they are made from
+
+  Every entry is a directory named after its key, holding ``deck.pptx``, ``deck.pdf``, preview
+  images and ``meta.json``. Entries are written to a temporary directory and renamed into place,
+  so readers never see partial entries. The total size of entries is kept in ``size.json``, the
+  least recently used entries are evicted once it grows over ``max_bytes``. Hit and miss counters
+  are kept in ``stats.json``, shared by all processes using the same cache directory.
+  """
+
+  def __init__(self, root, max_bytes=1 << 30):
+    """Initialize cache in directory
+
+    Args:
+      root (str): cache directory, created if it does not exist
+      max_bytes (int): size cap of all entries
+    """
+
+    self.root = root
+    self.max_bytes = max_bytes
+    os.makedirs(root, exist_ok=True)
+
+  def key(self, ptype, lang, sourcemeta, title, cls, options=None):
+    """Hash source file content, ppt arguments, template content and package version
+
+    Args:
+      ptype (str): ppt type
+      lang (str): language
+      sourcemeta (str): source csv or json file
+      title (str): title shown in ppt
+      cls (type): ppt class, whose templates are hashed
+      options (dict): other arguments changing the output, e.g, preview page range
+
+    Returns:
+      str: hex digest addressing the outputs
+    """
+
+    h = hashlib.sha256()
+    h.update(json.dumps([__version__, ptype, lang, title, options], sort_keys=True).encode("utf-8"))
+    _update_file(h, sourcemeta)
+    for genre in sorted(cls._templates):
+      _update_file(h, cls._templates[genre])
+    return h.hexdigest()
+
+  def get(self, key, require=(), restore=None):
+    """Look entry up, counting a hit or a miss
+
+    Args:
+      key (str): entry key
+      require (list of str): outputs the entry must hold to be a hit, ``pptx`` or ``pdf``
+      restore (callable): called with the entry to copy its outputs out, an OSError raised while
+        the entry is replaced or evicted by another process makes it a miss
+
+    Returns:
+      dict: entry meta info, with ``path`` of the entry directory, None if it is not cached
+    """
+
+    path = os.path.join(self.root, key)
+    try:
+      with open(os.path.join(path, "meta.json")) as f:
+        entry = dict(json.load(f), path=path)
+      os.utime(os.path.join(path, "meta.json"))
+      if not all(entry[output] for output in require):
+        entry = None
+      elif restore is not None:
+        restore(entry)
+    except (OSError, ValueError):
+      entry = None
+    self._count("misses" if entry is None else "hits")
+    return entry
+
+  def put(self, key, pptx=None, pdf=None, images=()):
+    """Store outputs of a job, then evict least recently used entries over the size cap
+
+    Args:
+      key (str): entry key
+      pptx (bytes): pptx content
+      pdf (bytes): pdf content
+      images (list of str): preview image files, stored in this order
+    """
+
+    tmp = tempfile.mkdtemp(prefix=".tmp_", dir=self.root)
+    meta = {"pptx": pptx is not None, "pdf": pdf is not None, "images": []}
+    for filename, content in (("deck.pptx", pptx), ("deck.pdf", pdf)):
+      if content is not None:
+        with open(os.path.join(tmp, filename), "wb") as f:
+          f.write(content)
+    os.mkdir(os.path.join(tmp, "images"))
+    for image in images:
+      shutil.copyfile(image, os.path.join(tmp, "images", os.path.basename(image)))
+      meta["images"].append(os.path.basename(image))
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+      json.dump(meta, f)
+    size = _dir_size(tmp)
+
+    with self._lock():
+      total = self._size()
+      path = os.path.join(self.root, key)
+      if os.path.isdir(path):
+        total -= _dir_size(path)
+        shutil.rmtree(path)
+      os.rename(tmp, path)
+      total += size
+      if total > self.max_bytes:
+        total = self._evict()
+      with open(os.path.join(self.root, "size.json"), "w") as f:
+        json.dump({"bytes": total}, f)
+
+  def stats(self):
+    """Return counters of the cache
+
+    Returns:
+      dict: ``hits`` and ``misses``
+    """
+
+    try:
+      with open(os.path.join(self.root, "stats.json")) as f:
+        return json.load(f)
+    except (OSError, ValueError):
+      return {"hits": 0, "misses": 0}
+
+  def _count(self, counter):
+    with self._lock():
+      stats = self.stats()
+      stats[counter] += 1
+      with open(os.path.join(self.root, "stats.json"), "w") as f:
+        json.dump(stats, f)
+
+  def _lock(self):
+    return _FileLock(os.path.join(self.root, ".lock"))
+
+  def _size(self):
+    """Return total size of entries from ``size.json``, summing the entries if it is missing
+    """
+
+    try:
+      with open(os.path.join(self.root, "size.json")) as f:
+        return json.load(f)["bytes"]
+    except (OSError, ValueError, KeyError):
+      return sum(size for _, size, _ in self._entries())
+
+  def _entries(self):
+    entries = []
+    for name in os.listdir(self.root):
+      path = os.path.join(self.root, name)
+      if name.startswith(".") or not os.path.isdir(path):
+        continue
+      size = _dir_size(path)
+      try:
+        used = os.path.getmtime(os.path.join(path, "meta.json"))
+      except OSError:
+        used = 0
+      entries.append((used, size, path))
+    return entries
+
+  def _evict(self):
+    """Remove least recently used entries until the cache fits in the size cap
+
+    Returns:
+      int: total size of the remaining entries
+    """
+
+    entries = self._entries()
+    total = sum(size for _, size, _ in entries)
+    for used, size, path in sorted(entries):
+      if total <= self.max_bytes:
+        break
+      shutil.rmtree(path, ignore_errors=True)
+      total -= size
+    return total
+
+
+class _FileLock:
+
+  def __init__(self, path):
+    self._path = path
+
+  def __enter__(self):
+    self._f = open(self._path, "a")
+    fcntl.flock(self._f, fcntl.LOCK_EX)
+    return self
+
+  def __exit__(self, *exc):
+    fcntl.flock(self._f, fcntl.LOCK_UN)
+    self._f.close()
+
+
+def _dir_size(path):
+  return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files)
+
+
+def _update_file(h, filename):
+  with open(filename, "rb") as f:
+    for chunk in iter(lambda: f.read(1 << 20), b""):
+      h.update(chunk)
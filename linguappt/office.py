@@ -0,0 +1,260 @@
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+
+class OfficeInstance:
+  """Headless office process with its own user profile, driven over a local pipe with UNO
+
+  Note:
+    UNO python bindings, e.g, ``python3-uno`` shipped with LibreOffice, are required and imported
+    when the instance starts.
+  """
+
+  def __init__(self, index, workdir, soffice="soffice", start_timeout=60):
+    """Initialize instance, the office process is not started yet
+
+    Args:
+      index (int): instance number, used in pipe and profile names
+      workdir (str): directory holding the profile directory of the instance
+      soffice (str): office executable
+      start_timeout (int): seconds to wait for office to accept connections
+    """
+
+    self.index = index
+    self.soffice = soffice
+    self.start_timeout = start_timeout
+    self.pipe = "linguappt_{}_{}".format(os.getpid(), index)
+    self.profile = os.path.join(workdir, "profile_{}".format(index))
+    self.restarts = 0
+    self._process = None
+    self._desktop = None
+
+  def start(self):
+    """Launch office and connect to it
+    """
+
+    try:
+      import uno
+    except ImportError:
+      raise ImportError("office pool requires UNO python bindings, e.g, python3-uno")
+
+    self._process = subprocess.Popen([
+      self.soffice, "--headless", "--invisible", "--nologo", "--norestore", "--nodefault", "--nolockcheck",
+      "--accept=pipe,name={};urp;StarOffice.ComponentContext".format(self.pipe),
+      "-env:UserInstallation=file://{}".format(os.path.abspath(self.profile)),
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    local = uno.getComponentContext()
+    resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+    url = "uno:pipe,name={};urp;StarOffice.ComponentContext".format(self.pipe)
+    deadline = time.monotonic() + self.start_timeout
+    while True:
+      try:
+        ctx = resolver.resolve(url)
+        break
+      except Exception:
+        if self._process.poll() is not None or time.monotonic() > deadline:
+          self.stop()
+          raise RuntimeError("office instance {} did not start".format(self.index))
+        time.sleep(0.25)
+    self._desktop = ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+
+  def healthy(self):
+    """Check that the office process runs and answers over the pipe
+
+    Returns:
+      bool: True if the instance can take jobs
+    """
+
+    if self._process is None or self._process.poll() is not None or self._desktop is None:
+      return False
+    try:
+      self._desktop.getComponents()
+    except Exception:
+      return False
+    return True
+
+  def convert(self, pptx, pdfpath):
+    """Export pptx as pdf
+
+    Args:
+      pptx (str): pptx file
+      pdfpath (str): pdf file path
+    """
+
+    import uno
+    from com.sun.star.beans import PropertyValue
+
+    def props(**kwargs):
+      values = []
+      for name, value in kwargs.items():
+        p = PropertyValue()
+        p.Name, p.Value = name, value
+        values.append(p)
+      return tuple(values)
+
+    doc = self._desktop.loadComponentFromURL(uno.systemPathToFileUrl(os.path.abspath(pptx)), "_blank", 0, props(Hidden=True))
+    if doc is None:
+      raise RuntimeError("office can not open {}".format(pptx))
+    try:
+      doc.storeToURL(uno.systemPathToFileUrl(os.path.abspath(pdfpath)), props(FilterName="impress_pdf_Export"))
+    finally:
+      doc.close(True)
+
+  def stop(self):
+    """Kill office process, the profile directory is kept for the next start
+    """
+
+    self._desktop = None
+    if self._process is not None and self._process.poll() is None:
+      self._process.terminate()
+      try:
+        self._process.wait(5)
+      except subprocess.TimeoutExpired:
+        self._process.kill()
+        self._process.wait()
+    self._process = None
+
+  def restart(self):
+    self.stop()
+    self.restarts += 1
+    self.start()
+
+
+class OfficePool:
+  """Pool of warm office instances converting pptx into pdf concurrently
+
+  Every instance has its own profile directory, so instances never block each other. Jobs wait in
+  a queue for an idle instance. An instance failing its health check is restarted before it takes
+  a job, and an instance exceeding the job timeout is considered hung and restarted.
+  """
+
+  def __init__(self, size=2, workdir=None, soffice="soffice", timeout=240, queue_timeout=None):
+    """Initialize pool, instances are started by :meth:`start`
+
+    Args:
+      size (int): number of office instances
+      workdir (str): directory holding instance profiles, default is a new temporary directory
+      soffice (str): office executable
+      timeout (int): seconds a conversion may take before its instance is restarted
+      queue_timeout (int): seconds a job waits for an idle instance, default is waiting forever
+    """
+
+    self.size = size
+    self.soffice = soffice
+    self.timeout = timeout
+    self.queue_timeout = queue_timeout
+    self._own_workdir = workdir is None
+    self.workdir = tempfile.mkdtemp(prefix="linguappt_office_") if workdir is None else workdir
+    self._instances = []
+    self._idle = queue.Queue()
+
+  def _new_instance(self, index):
+    return OfficeInstance(index, self.workdir, self.soffice)
+
+  def start(self):
+    """Start all instances
+
+    Returns:
+      OfficePool: the pool itself
+    """
+
+    for index in range(self.size):
+      instance = self._new_instance(index)
+      instance.start()
+      self._instances.append(instance)
+      self._idle.put(instance)
+    return self
+
+  def convert(self, pptx, pdffolder='./', timeout=None):
+    """Convert pptx into pdf on an idle instance
+
+    Args:
+      pptx (str): pptx file
+      pdffolder (str): folder that the pdf is stored in
+      timeout (int): seconds the conversion may take, default is the pool timeout
+
+    Returns:
+      str: pdf file path
+
+    Raises:
+      queue.Empty: if no instance becomes idle within ``queue_timeout``
+      TimeoutError: if the conversion exceeds ``timeout``
+    """
+
+    if not os.path.isdir(pdffolder):
+      os.mkdir(pdffolder)
+    pdfpath = os.path.join(pdffolder, os.path.basename(pptx).split('.')[0] + '.pdf')
+    timeout = self.timeout if timeout is None else timeout
+
+    instance = self._idle.get(timeout=self.queue_timeout)
+    try:
+      if not instance.healthy():
+        instance.restart()
+      result = {}
+      def run():
+        try:
+          instance.convert(pptx, pdfpath)
+        except Exception as e:
+          result["error"] = e
+      job = threading.Thread(target=run, daemon=True)
+      job.start()
+      job.join(timeout)
+      if job.is_alive():
+        instance.restart()
+        raise TimeoutError("converting {} took more than {} seconds".format(pptx, timeout))
+      if "error" in result:
+        raise result["error"]
+    finally:
+      self._idle.put(instance)
+    return pdfpath
+
+  def close(self):
+    """Stop all instances and remove the temporary profile directory
+    """
+
+    for instance in self._instances:
+      instance.stop()
+    self._instances = []
+    self._idle = queue.Queue()
+    if self._own_workdir:
+      shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+_active_pool = None
+
+def enable_office_pool(size=2, **kwargs):
+  """Start an office pool used by ``linguappt.lib.pptx2pdf`` from now on
+
+  Args:
+    size (int): number of office instances
+    **kwargs: other arguments of :class:`OfficePool`
+
+  Returns:
+    OfficePool: started pool
+  """
+
+  global _active_pool
+  disable_office_pool()
+  _active_pool = OfficePool(size, **kwargs).start()
+  return _active_pool
+
+def disable_office_pool():
+  """Stop the active office pool, ``linguappt.lib.pptx2pdf`` launches office per call again
+  """
+
+  global _active_pool
+  if _active_pool is not None:
+    _active_pool.close()
+    _active_pool = None
+
+def active_office_pool():
+  """Return the office pool enabled by :func:`enable_office_pool`, None if it is not enabled
+  """
+
+  return _active_pool
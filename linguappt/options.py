@@ -0,0 +1,18 @@
+"""Option values shared by ppt classes and commands, importable without python-pptx
+"""
+
+ENGINES = ("add_slide", "stamp")
+"""Slide rendering engines
+
+  * ``add_slide``: every slide is built by python-pptx, cloning layout placeholders one by one
+  * ``stamp``: the first slide of each layout is built by python-pptx and kept as prototype, later
+    slides of the layout are deep copies of the prototype XML
+"""
+
+NOTES = (True, False, "lazy")
+"""Speaker notes modes
+
+  * ``True``: notes slide is created as soon as notes are written
+  * ``False``: notes are skipped, no notes slide is created
+  * ``"lazy"``: notes are kept in memory and notes slides are created when the deck is saved
+"""
@@ -1,5 +1,6 @@
-from pptx import Presentation
-from linguappt.lib import readCSV
+from linguappt.lib import iter_csv
+from linguappt.validation import SourceError, validate_csv
+from linguappt.deck import Deck
 import json
 from abc import abstractmethod
 
@@ -27,10 +28,11 @@ class PhrasePPT:
     if self.__class__.__name__ != "PhrasePPT":
       self._assert_class_variables()
       self._template = self.__class__._templates[genre]
-      self._prs = Presentation(self._template)
-      self._title = title
       self._sourcefile = sourcefile
       self._assert_content()
+      self._deck = Deck(self.__class__, genre)
+      self._prs = self._deck.prs
+      self._title = title
     else:
       raise TypeError(self.__class__.__doc__)
 
@@ -42,27 +44,55 @@ class PhrasePPT:
     assert isinstance(cls.content_keys, list)
 
 
+  @property
+  def content(self):
+    """iterator of dict: records in csv file, read one at a time
+    """
+
+    return iter_csv(self._sourcefile)
+
   def _assert_content(self):
-    """Ensure the csv file content has keys defined in ppt class
+    """Ensure every record of the csv file has keys defined in ppt class and json in every column, before the template is loaded
+
+    Raises:
+      SourceError: if any record is invalid, listing all invalid records
     """
 
-    content = readCSV(self._sourcefile) 
-    for e in content:
-      keys = e.keys()
-      assert(len(keys) == len(self.__class__.content_keys))
-      for k in keys:
-        assert(k in self.__class__.content_keys)
-    self.content = content
+    errors = self.__class__.validate_source(self._sourcefile)
+    if len(errors) > 0:
+      raise SourceError(self._sourcefile, errors)
+
+  @classmethod
+  def validate_source(cls, sourcefile):
+    """Check every record of source csv file in one pass, without loading the template
+
+    Args:
+      sourcefile (str): csv file, whose content is written into ppt
+
+    Returns:
+      list of tuple: ``(line, message)`` for every invalid record, empty if the file is valid
+    """
+
+    content_keys = cls.content_keys
+    return validate_csv(sourcefile, content_keys, lambda row: [json.loads(row[k]) for k in content_keys])
+
+  def _add_slide(self, layout_name):
+    """Append slide created from template layout
+
+    Args:
+      layout_name (str): name of slide layout in template
+
+    Returns:
+      tuple: ``(slide, holders)``, where ``holders[idx]`` is the placeholder with ``idx``
+    """
 
+    return self._deck.add_slide(layout_name)
 
   def _create_opening(self):
     """Create home slide
     """
 
-    layout = self._prs.slide_layouts.get_by_name("Opening")
-
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide("Opening")
  
     title = holders[10] 
     title.text_frame.text = self._title
@@ -73,27 +103,56 @@ class PhrasePPT:
     """Create ending slide
     """
 
-    layout = self._prs.slide_layouts.get_by_name("Thanks")
-    self._prs.slides.add_slide(layout)
+    self._add_slide("Thanks")
 
   def _save_ppt(self, destfile):
-    """Save ppt object into file
+    """Save ppt object into file, or into memory if ``destfile`` is None, pruning unused slide layouts first in compact mode
     """
 
-    self._prs.save(destfile)
+    return self._deck.save(destfile)
+
+  @property
+  def pruned_bytes(self):
+    """int: bytes left out of the saved pptx by pruning unused slide layouts and their media
+    """
+
+    return self._deck.pruned_bytes
+
+  def save_preview(self, destfile, slides=6):
+    """Save a trimmed copy of the converted ppt, holding only the slides shown in preview
 
-  def convert_to_ppt(self, destfile='test.pptx'):
+    Args:
+      destfile (str or file): pptx file path or writable binary file, None saves into memory
+      slides (int): number of leading slides kept, e.g, opening, statistics and first contents
+
+    Returns:
+      io.BytesIO: pptx content if ``destfile`` is None
+    """
+
+    return self._deck.save_preview(destfile, slides)
+
+  def convert_to_ppt(self, destfile='test.pptx', engine="add_slide", deterministic=False, compact=False):
     """Convert csv file containing vocabulary information into pptx file
 
     Args:
-      destfile (str): pptx file path
+      destfile (str or file): pptx file path or writable binary file, None saves into memory
+      engine (str): slide rendering engine, ``add_slide`` or ``stamp``, see :data:`linguappt.deck.ENGINES`
+      deterministic (bool): save the same bytes for the same csv file and title, see :meth:`linguappt.deck.Deck.save`
+      compact (bool): leave slide layouts no slide uses, and media only they use, out of the pptx, the saved size is reported by :attr:`pruned_bytes`
+
+    Returns:
+      io.BytesIO: pptx content if ``destfile`` is None
     """
 
+    self._deck.engine = engine
+    self._deck.deterministic = deterministic
+    self._deck.compact = compact
+
     self._create_opening()
     self._create_phrase()
     self._create_ending()
 
-    self._save_ppt(destfile)    
+    return self._save_ppt(destfile)
 
   @abstractmethod
   def _create_phrase(self):
@@ -0,0 +1,203 @@
+from linguappt.lib import pptx2pdf, pdf2images, IMAGE_FORMATS, _content
+from xml.etree import ElementTree
+import hashlib
+import io
+import json
+import os
+import posixpath
+import re
+import zipfile
+
+FINGERPRINTS_FILE = "fingerprints.json"
+"""File in the image folder keeping the slide fingerprints of its images, see :func:`pptx2images`
+"""
+
+_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+_SLD_ID = "{http://schemas.openxmlformats.org/presentationml/2006/main}sldId"
+_R_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+
+def slide_fingerprints(pptx):
+  """Hash every slide together with the parts it is rendered from, e.g, layout, master, theme and media
+
+  Notes slides are left out, so editing speaker notes changes no fingerprint. Slides showing their
+  slide number are hashed with their position.
+
+  Args:
+    pptx (str or bytes or file): pptx file, or pptx content as bytes or readable binary file
+
+  Returns:
+    list of str: fingerprint of every slide, in presentation order
+  """
+
+  with zipfile.ZipFile(pptx if isinstance(pptx, str) else io.BytesIO(_content(pptx))) as z:
+    package = _Package(z)
+    size = re.search(rb"<p:sldSz[^>]*>", z.read("ppt/presentation.xml"))
+    fingerprints = []
+    for index, partname in enumerate(package.slides()):
+      h = hashlib.sha256(size.group(0) if size else b"")
+      h.update(package.digest(partname, slide=True).encode())
+      if b'type="slidenum"' in z.read(partname):
+        h.update(str(index).encode())
+      fingerprints.append(h.hexdigest())
+  return fingerprints
+
+
+def pptx2images(pptx, imgfolder, fmt="jpg", quality=None, widths=None):
+  """Render slide images of pptx, converting only slides changed since images were last rendered into the folder
+
+  Slide fingerprints of the rendered images are kept in :data:`FINGERPRINTS_FILE` of ``imgfolder``.
+  Changed slides are exported as a sub-deck, which is converted into pdf and rasterized, while images
+  of unchanged slides stay in place. Images are named after the slide number, as by
+  :func:`linguappt.lib.pdf2images`, images of slides beyond the end of the deck are removed. The
+  pdf is kept in memory only.
+
+  Args:
+    pptx (str or bytes or file): pptx file, or pptx content as bytes or readable binary file
+    imgfolder (str): image folder
+    fmt (str): image format, one of :data:`linguappt.lib.IMAGE_FORMATS`
+    quality (int): encoder quality of jpg and webp, default is the PIL default
+    widths (list of int): image widths, see :func:`linguappt.lib.pdf2images`
+
+  Yields:
+    dict: phase event, ``{"step": ..., "msg": ...}``, the last one reports ``images_len`` and ``reused`` images
+  """
+
+  if fmt not in IMAGE_FORMATS:
+    raise ValueError("unknown image format {}, expected one of {}".format(fmt, ", ".join(IMAGE_FORMATS)))
+  if isinstance(pptx, str):
+    with open(pptx, "rb") as f:
+      content = f.read()
+  else:
+    content = _content(pptx)
+  fingerprints = slide_fingerprints(content)
+  settings = {"fmt": fmt, "quality": quality, "widths": widths}
+  folders = [imgfolder] if widths is None else [os.path.join(imgfolder, "full" if w is None else str(w)) for w in widths]
+  previous = _read_fingerprints(imgfolder, settings)
+  changed = [
+    index for index, fingerprint in enumerate(fingerprints)
+    if index >= len(previous) or previous[index] != fingerprint
+    or not all(os.path.isfile(os.path.join(folder, "{}.{}".format(index, fmt))) for folder in folders)
+  ]
+
+  yield {"step": 1, "msg": "Start pdf generation", "slides": len(changed)}
+
+  if len(changed) > 0:
+    pdf = pptx2pdf(content if len(changed) == len(fingerprints) else _sub_deck(content, changed))
+
+  yield {"step": 2, "msg": "Finish pdf generation"}
+  yield {"step": 3, "msg": "Start images generation"}
+
+  if len(changed) > 0:
+    pdf2images(pdf, imgfolder, fmt=fmt, quality=quality, widths=widths, indexes=changed)
+  _remove_images(folders, fmt, len(fingerprints))
+  if not os.path.isdir(imgfolder):
+    os.mkdir(imgfolder)
+  with open(os.path.join(imgfolder, FINGERPRINTS_FILE), "w") as f:
+    json.dump(dict(settings, fingerprints=fingerprints), f)
+
+  yield {"step": 4, "msg": "Finish images generation", "images_len": len(fingerprints), "reused": len(fingerprints) - len(changed)}
+
+
+def _read_fingerprints(imgfolder, settings):
+  """Read fingerprints of images in folder, empty if they are missing or rendered with other settings
+  """
+
+  try:
+    with open(os.path.join(imgfolder, FINGERPRINTS_FILE)) as f:
+      saved = json.load(f)
+    if all(saved[k] == v for k, v in settings.items()):
+      return saved["fingerprints"]
+  except (OSError, ValueError, KeyError):
+    pass
+  return []
+
+
+def _remove_images(folders, fmt, count):
+  pattern = re.compile(r"^(\d+)\.{}$".format(re.escape(fmt)))
+  for folder in folders:
+    if not os.path.isdir(folder):
+      continue
+    for name in os.listdir(folder):
+      m = pattern.match(name)
+      if m is not None and int(m.group(1)) >= count:
+        os.remove(os.path.join(folder, name))
+
+
+def _sub_deck(content, indexes):
+  """Save a copy of the deck holding only the slides at indexes
+
+  Returns:
+    bytes: pptx content
+  """
+
+  from pptx import Presentation
+  prs = Presentation(io.BytesIO(content))
+  kept = set(indexes)
+  sldIdLst = prs.slides._sldIdLst
+  rels = prs.part.rels
+  for index, sldId in enumerate(list(sldIdLst)):
+    if index not in kept:
+      rels.pop(sldId.rId)
+      sldIdLst.remove(sldId)
+  stream = io.BytesIO()
+  prs.save(stream)
+  return stream.getvalue()
+
+
+class _Package:
+  """Read-only view of the parts and relationships of a pptx zip
+  """
+
+  def __init__(self, z):
+    self._zip = z
+    self._names = set(z.namelist())
+    self._digests = {}
+
+  def rels(self, partname):
+    """Return relationships of part
+
+    Returns:
+      list of tuple: ``(rId, reltype, target, external)``, internal targets are zip member names
+    """
+
+    directory, name = posixpath.split(partname)
+    relsname = posixpath.join(directory, "_rels", name + ".rels")
+    if relsname not in self._names:
+      return []
+    rels = []
+    for rel in ElementTree.fromstring(self._zip.read(relsname)).iter(_REL):
+      external = rel.get("TargetMode") == "External"
+      target = rel.get("Target")
+      if not external:
+        target = posixpath.normpath(target[1:] if target.startswith("/") else posixpath.join(directory, target))
+      rels.append((rel.get("Id"), rel.get("Type"), target, external))
+    return rels
+
+  def slides(self):
+    """Return zip member names of slides in presentation order
+    """
+
+    targets = {rId: target for rId, _, target, _ in self.rels("ppt/presentation.xml")}
+    root = ElementTree.fromstring(self._zip.read("ppt/presentation.xml"))
+    return [targets[sldId.get(_R_ID)] for sldId in root.iter(_SLD_ID)]
+
+  def digest(self, partname, slide=False):
+    """Hash part with the parts it relates to, leaving out notes slides, other slides and, except from a slide, layouts
+    """
+
+    if not slide and partname in self._digests:
+      return self._digests[partname]
+    if not slide:
+      self._digests[partname] = ""
+    h = hashlib.sha256(self._zip.read(partname))
+    for rId, reltype, target, external in self.rels(partname):
+      kind = reltype.rsplit("/", 1)[-1]
+      if kind in ("notesSlide", "slide") or (kind == "slideLayout" and not slide):
+        continue
+      h.update("{} {} ".format(rId, kind).encode())
+      h.update((target if external or target not in self._names else self.digest(target)).encode())
+    result = h.hexdigest()
+    if not slide:
+      self._digests[partname] = result
+    return result
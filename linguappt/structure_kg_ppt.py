@@ -1,5 +1,6 @@
-from pptx import Presentation
-from linguappt.lib import read_json
+from linguappt.lib import iter_json
+from linguappt.validation import SourceError, validate_json
+from linguappt.deck import Deck
 import json
 from abc import abstractmethod
 
@@ -27,10 +28,11 @@ class StructureKGPPT:
     if self.__class__.__name__ != "StructureKGPPT":
       self._assert_class_variables()
       self._template = self.__class__._templates[genre]
-      self._prs = Presentation(self._template)
-      self._title = title
       self._sourcefile = sourcefile
       self._assert_content()
+      self._deck = Deck(self.__class__, genre)
+      self._prs = self._deck.prs
+      self._title = title
     else:
       raise TypeError(self.__class__.__doc__)
 
@@ -42,27 +44,54 @@ class StructureKGPPT:
     assert isinstance(cls.content_keys, list)
 
 
+  @property
+  def content(self):
+    """iterator of dict: records in json or json lines file, read one at a time
+    """
+
+    return iter_json(self._sourcefile)
+
   def _assert_content(self):
-    """Ensure the json file content has keys defined in ppt class
+    """Ensure every record of the json file has keys defined in ppt class, before the template is loaded
+
+    Raises:
+      SourceError: if any record is invalid, listing all invalid records
     """
 
-    content = read_json(self._sourcefile) 
-    for e in content:
-      keys = e.keys()
-      assert(len(keys) == len(self.__class__.content_keys))
-      for k in keys:
-        assert(k in self.__class__.content_keys)
-    self.content = content
+    errors = self.__class__.validate_source(self._sourcefile)
+    if len(errors) > 0:
+      raise SourceError(self._sourcefile, errors)
 
+  @classmethod
+  def validate_source(cls, sourcefile):
+    """Check every record of source json file in one pass, without loading the template
+
+    Args:
+      sourcefile (str): json or json lines file, whose content is written into ppt
+
+    Returns:
+      list of tuple: ``(line, message)`` for every invalid record, empty if the file is valid
+    """
+
+    return validate_json(sourcefile, cls.content_keys)
+
+  def _add_slide(self, layout_name):
+    """Append slide created from template layout
+
+    Args:
+      layout_name (str): name of slide layout in template
+
+    Returns:
+      tuple: ``(slide, holders)``, where ``holders[idx]`` is the placeholder with ``idx``
+    """
+
+    return self._deck.add_slide(layout_name)
 
   def _create_opening(self):
     """Create home slide
     """
 
-    layout = self._prs.slide_layouts.get_by_name("Opening")
-
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide("Opening")
  
     title = holders[10] 
     title.text_frame.text = self._title
@@ -73,27 +102,56 @@ class StructureKGPPT:
     """Create ending slide
     """
 
-    layout = self._prs.slide_layouts.get_by_name("Thanks")
-    self._prs.slides.add_slide(layout)
+    self._add_slide("Thanks")
 
   def _save_ppt(self, destfile):
-    """Save ppt object into file
+    """Save ppt object into file, or into memory if ``destfile`` is None, pruning unused slide layouts first in compact mode
+    """
+
+    return self._deck.save(destfile)
+
+  @property
+  def pruned_bytes(self):
+    """int: bytes left out of the saved pptx by pruning unused slide layouts and their media
+    """
+
+    return self._deck.pruned_bytes
+
+  def save_preview(self, destfile, slides=6):
+    """Save a trimmed copy of the converted ppt, holding only the slides shown in preview
+
+    Args:
+      destfile (str or file): pptx file path or writable binary file, None saves into memory
+      slides (int): number of leading slides kept, e.g, opening, statistics and first contents
+
+    Returns:
+      io.BytesIO: pptx content if ``destfile`` is None
     """
 
-    self._prs.save(destfile)
+    return self._deck.save_preview(destfile, slides)
 
-  def convert_to_ppt(self, destfile='test.pptx'):
+  def convert_to_ppt(self, destfile='test.pptx', engine="add_slide", deterministic=False, compact=False):
     """Convert csv file containing vocabulary information into pptx file
 
     Args:
-      destfile (str): pptx file path
+      destfile (str or file): pptx file path or writable binary file, None saves into memory
+      engine (str): slide rendering engine, ``add_slide`` or ``stamp``, see :data:`linguappt.deck.ENGINES`
+      deterministic (bool): save the same bytes for the same json file and title, see :meth:`linguappt.deck.Deck.save`
+      compact (bool): leave slide layouts no slide uses, and media only they use, out of the pptx, the saved size is reported by :attr:`pruned_bytes`
+
+    Returns:
+      io.BytesIO: pptx content if ``destfile`` is None
     """
 
+    self._deck.engine = engine
+    self._deck.deterministic = deterministic
+    self._deck.compact = compact
+
     self._create_opening()
     self._create_structure_kg()
     self._create_ending()
 
-    self._save_ppt(destfile)    
+    return self._save_ppt(destfile)
 
   
   @abstractmethod
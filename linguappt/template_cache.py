@@ -0,0 +1,235 @@
+from collections import OrderedDict
+import copy
+import os
+import threading
+
+
+class CompiledTemplate:
+  """Lookup tables compiled once per template
+
+  Attributes:
+    layout_index (dict): key is layout name, value is position of the layout in ``slide_layouts``
+    placeholder_positions (dict): key is layout name, value is dict mapping placeholder ``idx``
+      to the position of the placeholder shape on a slide newly created from the layout
+  """
+
+  def __init__(self, prs):
+    """Compile lookup tables from parsed template
+
+    Args:
+      prs (pptx.presentation.Presentation): pristine template presentation
+    """
+
+    self.layout_index = {}
+    self.placeholder_positions = {}
+    for index, layout in enumerate(prs.slide_layouts):
+      if layout.name in self.layout_index:
+        continue
+      self.layout_index[layout.name] = index
+      positions = {}
+      for pos, ph in enumerate(layout.iter_cloneable_placeholders()):
+        positions.setdefault(ph.placeholder_format.idx, pos)
+      self.placeholder_positions[layout.name] = positions
+
+  def layouts_of(self, prs):
+    """Map layout names to layout objects of a copy of the template
+
+    Args:
+      prs (pptx.presentation.Presentation): copy of the template this object is compiled from
+
+    Returns:
+      dict: key is layout name, value is ``SlideLayout``
+    """
+
+    layouts = list(prs.slide_layouts)
+    return {name: layouts[index] for name, index in self.layout_index.items()}
+
+
+class TemplateCache:
+  """Process-wide cache of parsed pptx templates
+
+  Templates are parsed and compiled into a :class:`CompiledTemplate` once and kept in memory;
+  every job receives an independent copy of the parsed package, so slides added by one job never
+  leak into another. Jobs leaving masters and layouts unchanged may share them, see :meth:`checkout`.
+
+  Note:
+    Entries are keyed by ``(class, genre, mtime, size)`` of the template file, so a template
+    replaced on disk is parsed again on next use. The least recently used entry is evicted once
+    ``maxsize`` entries are cached.
+  """
+
+  def __init__(self, maxsize=16):
+    """Initialize an empty cache
+
+    Args:
+      maxsize (int): maximum number of parsed templates kept in memory
+    """
+
+    self.maxsize = maxsize
+    self.hits = 0
+    self.misses = 0
+    self._entries = OrderedDict()
+    self._lock = threading.Lock()
+
+  def __len__(self):
+    return len(self._entries)
+
+  @staticmethod
+  def _key(cls, genre):
+    template = cls._templates[genre]
+    st = os.stat(template)
+    return (cls, genre, st.st_mtime_ns, st.st_size)
+
+  def _load(self, cls, genre):
+    """Return the cached pristine presentation and its compiled tables, parsing them on a miss
+    """
+
+    key = self._key(cls, genre)
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is not None:
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    from pptx import Presentation
+    prs = Presentation(cls._templates[genre])
+    entry = (prs, CompiledTemplate(prs))
+
+    with self._lock:
+      self.misses += 1
+      for k in [k for k in self._entries if k[:2] == key[:2]]:
+        del self._entries[k]
+      self._entries[key] = entry
+      while len(self._entries) > self.maxsize:
+        self._entries.popitem(last=False)
+    return entry
+
+  def get(self, cls, genre="classic"):
+    """Return an independent copy of the parsed template
+
+    Args:
+      cls (type): ppt class, whose class variable ``_templates`` maps genre to template path
+      genre (str): ppt template style
+
+    Returns:
+      pptx.presentation.Presentation: presentation which can be modified freely
+    """
+
+    return self.checkout(cls, genre)[0]
+
+  def checkout(self, cls, genre="classic", share=False):
+    """Return an independent copy of the parsed template along with its compiled lookup tables
+
+    Args:
+      cls (type): ppt class
+      genre (str): ppt template style
+      share (bool): copy only the package, the presentation part and their relationships, which
+        adding slides and notes changes, sharing masters, layouts, themes and media with the cached
+        template. The copy must leave shared parts unchanged, e.g, not prune layouts
+
+    Returns:
+      tuple: ``(presentation, compiled)``, where ``compiled`` is the :class:`CompiledTemplate`
+      shared by all copies of the template
+    """
+
+    prs, compiled = self._load(cls, genre)
+    if share:
+      return _share_copy(prs), compiled
+    return copy.deepcopy(prs), compiled
+
+  def prewarm(self, classes=None):
+    """Parse every template registered in ``_templates`` of ``classes``
+
+    Args:
+      classes (list of type): ppt classes, default is all ppt classes exported by ``linguappt``
+
+    Returns:
+      int: number of templates loaded
+    """
+
+    if classes is None:
+      classes = registered_classes()
+    count = 0
+    for cls in classes:
+      for genre in cls._templates:
+        self._load(cls, genre)
+        count += 1
+    return count
+
+  def clear(self):
+    """Drop all cached templates and reset counters
+    """
+
+    with self._lock:
+      self._entries.clear()
+      self.hits = 0
+      self.misses = 0
+
+
+def _share_copy(prs):
+  """Copy package and presentation part of a parsed template, all other parts are shared
+
+  Returns:
+    pptx.presentation.Presentation: presentation of the copied package
+  """
+
+  package = prs.part.package
+  clone = type(package)(package._pkg_file)
+  prs_part = prs.part
+  part = type(prs_part)(prs_part.partname, prs_part.content_type, clone, copy.deepcopy(prs_part._element))
+  _copy_rels(package._rels, clone._rels, prs_part, part)
+  _copy_rels(prs_part.rels, part.rels, prs_part, part)
+  return part.presentation
+
+
+def _copy_rels(rels, dest, prs_part, part):
+  from pptx.opc.package import _Relationship
+  for rId, rel in rels.items():
+    target = part if rel._target is prs_part else rel._target
+    dest._rels[rId] = _Relationship(dest._base_uri, rId, rel.reltype, rel._target_mode, target)
+
+
+def registered_classes():
+  """Return all ppt classes exported by ``linguappt``
+
+  Returns:
+    list of type: vocabulary, phrase and structure kg ppt classes
+  """
+
+  import linguappt
+  return [
+    linguappt.EnglishVocabPPT, linguappt.SpanishVocabPPT,
+    linguappt.EnglishPhrasePPT, linguappt.SpanishPhrasePPT, linguappt.GermanPhrasePPT,
+    linguappt.EnglishStructureKGPPT, linguappt.SpanishStructureKGPPT, linguappt.GermanStructureKGPPT,
+  ]
+
+
+template_cache = TemplateCache()
+
+
+def load_template(cls, genre="classic"):
+  """Return an independent copy of the template of ``cls`` from the process-wide cache
+
+  Args:
+    cls (type): ppt class
+    genre (str): ppt template style
+
+  Returns:
+    pptx.presentation.Presentation: presentation which can be modified freely
+  """
+
+  return template_cache.get(cls, genre)
+
+
+def prewarm_templates(classes=None):
+  """Parse all registered templates into the process-wide cache, e.g, at service startup
+
+  Args:
+    classes (list of type): ppt classes, default is all ppt classes exported by ``linguappt``
+
+  Returns:
+    int: number of templates loaded
+  """
+
+  return template_cache.prewarm(classes)
@@ -0,0 +1,100 @@
+from linguappt.lib import iter_json
+import csv
+import os
+
+
+class SourceError(ValueError):
+  """Source file of ppt does not match the format expected by ppt class
+
+  Attributes:
+    sourcefile (str): source file path
+    errors (list of tuple): ``(line, message)`` for every invalid record, ``line`` is the line number in csv file, or the record number in json file, 0 if the whole file is invalid
+  """
+
+  MAX_REPORTED = 20
+
+  def __init__(self, sourcefile, errors):
+    self.sourcefile = sourcefile
+    self.errors = errors
+    lines = ["  line {}: {}".format(line, msg) for line, msg in errors[:self.MAX_REPORTED]]
+    if len(errors) > self.MAX_REPORTED:
+      lines.append("  ... {} more".format(len(errors) - self.MAX_REPORTED))
+    super().__init__("\n".join(["{} has {} invalid records".format(sourcefile, len(errors))] + lines))
+
+
+def _header_error(header, content_keys):
+  if len(header) != len(content_keys) or set(header) != set(content_keys):
+    return "header {} does not match {}".format(header, content_keys)
+  return None
+
+
+def validate_csv(filename, content_keys, decode=None):
+  """Check every record of csv file in one pass, without building any ppt
+
+  Args:
+    filename (str): csv file name
+    content_keys (list of str): expected header of csv file
+    decode (callable): called with each record as dict, raises ``ValueError``, ``KeyError`` or ``TypeError`` if the record can not be decoded, e.g, broken json column
+
+  Returns:
+    list of tuple: ``(line, message)`` for every invalid record, empty if the file is valid
+  """
+
+  if not os.path.isfile(filename):
+    return [(0, "{} DOES NOT exist".format(filename))]
+
+  errors = []
+  with open(filename) as csvfile:
+    cursor = csv.reader(csvfile, skipinitialspace=True, delimiter='\t')
+    header = next(cursor, None)
+    if header is None:
+      return [(1, "missing header")]
+    msg = _header_error(header, content_keys)
+    if msg is not None:
+      return [(1, msg)]
+
+    width = len(header)
+    for row in cursor:
+      if len(row) < width:
+        errors.append((cursor.line_num, "expected {} columns, got {}".format(width, len(row))))
+        continue
+      if decode is not None:
+        try:
+          decode(dict(zip(header, row)))
+        except (ValueError, KeyError, TypeError) as e:
+          errors.append((cursor.line_num, "{}: {}".format(type(e).__name__, e)))
+  return errors
+
+
+def _record_error(record, content_keys):
+  if not isinstance(record, dict):
+    return "expected object, got {}".format(type(record).__name__)
+  if len(record) != len(content_keys) or set(record) != set(content_keys):
+    return "keys {} do not match {}".format(list(record), content_keys)
+  return None
+
+
+def validate_json(filename, content_keys):
+  """Check every record of json or json lines file in one pass, without building any ppt
+
+  Args:
+    filename (str): json file name, containing an array of objects, or json lines file name
+    content_keys (list of str): expected keys of each object
+
+  Returns:
+    list of tuple: ``(record, message)`` for every invalid record, ``record`` counts from 1, empty if the file is valid
+  """
+
+  if not os.path.isfile(filename):
+    return [(0, "{} DOES NOT exist".format(filename))]
+
+  errors = []
+  index = 0
+  try:
+    for index, record in enumerate(iter_json(filename), 1):
+      msg = _record_error(record, content_keys)
+      if msg is not None:
+        errors.append((index, msg))
+  except ValueError as e:
+    errors.append((index+1, "{}: {}".format(type(e).__name__, e)))
+  return errors
@@ -1,7 +1,15 @@
-from pptx import Presentation
-from linguappt.lib import readCSV
-import json
+from linguappt.lib import iter_csv
+from linguappt.validation import SourceError, validate_csv
+from linguappt.deck import Deck
+from linguappt.vocab_record import VocabRecord
+from linguappt import __version__
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
 from abc import abstractmethod
+import hashlib
+import io
+import json
+import os
+import zipfile
 
 
 class VocabPPT:
@@ -13,7 +21,7 @@ class VocabPPT:
       1. Define subclass inheriting ``VocabPPT``, e.g, ``ChineseVocabPPT`` 
       2. Define class variable ``_templates``, which is a :obj:`dict`, key is template genre, value is template path
       3. Define class variable ``content_keys``, which is a :obj:`list`, containing the heads in csv file
-      4. Implement methods ``_create_noun(self, v)``, ``_create_verb(self, v)``, ``_create_adj(self, v)``, where ``v`` is a vocab object, corresponding to a record (one line) in csv file
+      4. Implement methods ``_create_noun(self, v)``, ``_create_verb(self, v)``, ``_create_adj(self, v)``, where ``v`` is a :class:`linguappt.vocab_record.VocabRecord`, corresponding to a record (one line) in csv file
     
   """
 
@@ -29,11 +37,14 @@ class VocabPPT:
     if self.__class__.__name__ != "VocabPPT":
       self._assert_class_variables()
       self._template = self.__class__._templates[genre]
-      self._prs = Presentation(self._template)
-      self._title = title
       self._sourcefile = sourcefile
       self._assert_content()
-      self._divide_by_pos()
+      self._deck = Deck(self.__class__, genre)
+      self._prs = self._deck.prs
+      self._title = title
+      self.pos_counts = {}
+      self.reused_records = 0
+      self.rebuilt_records = 0
     else:
       raise TypeError(self.__class__.__doc__)
 
@@ -44,40 +55,66 @@ class VocabPPT:
     assert cls.content_keys != None
     assert isinstance(cls.content_keys, list)
 
-  def _divide_by_pos(self):
-    """Store words in ``self.word_distribution`` as dict, whose key is PoS (part of speech) defined in ``EnglisgVocabMeta.pos_info`` and value is a list of words.
+  @property
+  def content(self):
+    """iterator of VocabRecord: records in csv file, read and decoded one at a time
     """
 
-    word_distribution  = {}
+    metainfo = self.__class__._metainfo
+    return (VocabRecord.from_row(e, metainfo) for e in iter_csv(self._sourcefile))
 
-    for e in self.content:
-      key = self.__class__._metainfo.get_pos(e["dict_pos"])
-      if key in self.__class__.ALLOWED_POSES:
-        if key not in word_distribution:
-          word_distribution[key] = []
-        word_distribution[key].append(e)
-    self.word_distribution = word_distribution
+  def _assert_content(self):
+    """Ensure every record of the csv file has keys defined in ppt class and decodable json columns, before the template is loaded
+
+    Raises:
+      SourceError: if any record is invalid, listing all invalid records
+    """
 
+    errors = self.__class__.validate_source(self._sourcefile)
+    if len(errors) > 0:
+      raise SourceError(self._sourcefile, errors)
 
-  def _assert_content(self):
-    """Ensure the csv file content has keys defined in ppt class
+  @classmethod
+  def validate_source(cls, sourcefile):
+    """Check every record of source csv file in one pass, without loading the template
+
+    Args:
+      sourcefile (str): csv file, whose content is written into ppt
+
+    Returns:
+      list of tuple: ``(line, message)`` for every invalid record, empty if the file is valid
     """
 
-    content = readCSV(self._sourcefile) 
-    for e in content:
-      keys = e.keys()
-      assert(len(keys) == len(self.__class__.content_keys))
-      for k in keys:
-        assert(k in self.__class__.content_keys)
-    self.content = content
+    metainfo = cls._metainfo
+    return validate_csv(sourcefile, cls.content_keys, lambda row: VocabRecord.from_row(row, metainfo))
+
+  def _add_slide(self, layout_name):
+    """Append slide created from template layout
+
+    Args:
+      layout_name (str): name of slide layout in template
+
+    Returns:
+      tuple: ``(slide, holders)``, where ``holders[idx]`` is the placeholder with ``idx``
+    """
+
+    return self._deck.add_slide(layout_name)
+
+  def _set_notes(self, slide, text):
+    """Write speaker notes of slide
+
+    Args:
+      slide (pptx.slide.Slide): slide returned by ``_add_slide``
+      text (str): notes text
+    """
+
+    self._deck.set_notes(slide, text)
 
   def _create_opening(self):
     """Create home slide
     """
 
-    layout = self._prs.slide_layouts.get_by_name("Opening")
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide("Opening")
  
     title = holders[10] 
     title.text_frame.text = self._title
@@ -88,22 +125,19 @@ class VocabPPT:
     """Create statistic slide
     """
 
-    layout = self._prs.slide_layouts.get_by_name("Statistics")
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide("Statistics")
 
-    for index, (pos, ws) in enumerate(self.word_distribution.items()):
+    for index, (pos, count) in enumerate(self.pos_counts.items()):
       pos_name = holders[11+2*index]
       num = holders[10+2*index]
       pos_name.text_frame.text = self.__class__._metainfo.get_pos_name(pos).upper() 
-      num.text_frame.text = str(len(ws))
+      num.text_frame.text = str(count)
 
   def _create_ending(self):
     """Create ending slide
     """
 
-    layout = self._prs.slide_layouts.get_by_name("Thanks")
-    self._prs.slides.add_slide(layout)
+    self._add_slide("Thanks")
 
   def _create_vocab_title(self, title_content, subtitle_content):
     """Create vocabulary title slide for PoS
@@ -113,9 +147,7 @@ class VocabPPT:
       subtitle_content (str): subtitle displayed in slide
     """
 
-    layout = self._prs.slide_layouts.get_by_name('Title for pos')
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide('Title for pos')
 
     title = holders[10]
     title.text_frame.text = title_content
@@ -126,44 +158,35 @@ class VocabPPT:
     """Create default vocabulary slide, displaying word and its meaning
 
     Args:
-      v (dict): vocabuary object, its keys should be the same as defined in subclass variable ``content_keys``
+      v (VocabRecord): vocabuary object, decoded from a record (one line) in csv file
     """
 
-    layout = self._prs.slide_layouts.get_by_name("Default")
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide("Default")
 
     pos, noun, meaning = holders[10], holders[11], holders[12]
-    pos.text_frame.text = v["dict_pos"]
-    noun.text_frame.text = v["word"]
-    ms = v["meaning"].split(",")
-    if len(ms) > 4:
-      ms = ms[:4]
+    pos.text_frame.text = v.dict_pos
+    noun.text_frame.text = v.word
+    ms = v.meanings[:4]
     meaning.text_frame.text = "\n".join(ms) 
 
-    note = slide.notes_slide
-    note.notes_text_frame.text = v["word"]
+    self._set_notes(slide, v.word)
 
   def _create_default_word_with_examples(self, v):
     """Create default vocabulary with examples slide, displaying word, its meaning and examples 
 
     Args:
-      v (dict): vocabuary object, its keys should be the same as defined in subclass variable ``content_keys``
+      v (VocabRecord): vocabuary object, decoded from a record (one line) in csv file
     """
 
-    layout = self._prs.slide_layouts.get_by_name("Default with examples")
-    slide = self._prs.slides.add_slide(layout)
-    holders = slide.shapes.placeholders
+    slide, holders = self._add_slide("Default with examples")
 
     pos, noun, meaning = holders[10], holders[11], holders[12]
-    pos.text_frame.text = v["dict_pos"]
-    noun.text_frame.text = v["word"]
-    ms = v["meaning"].split(",")
-    if len(ms) > 4:
-      ms = ms[:4]
+    pos.text_frame.text = v.dict_pos
+    noun.text_frame.text = v.word
+    ms = v.meanings[:4]
     meaning.text_frame.text = "\n".join(ms) 
 
-    examples = json.loads(v["examples"])
+    examples = v.examples
     if len(examples) >= 1:
       original, translated = holders[13], holders[14]
       ex = examples[0]
@@ -175,8 +198,7 @@ class VocabPPT:
       original.text_frame.text = ex["original"]
       translated.text_frame.text = ex["translated"]
 
-    note = slide.notes_slide
-    note.notes_text_frame.text = v["word"]
+    self._set_notes(slide, v.word)
 
 
   def _create_vocab_group(self, pos, vocabs):
@@ -184,7 +206,7 @@ class VocabPPT:
 
     Args:
       pos (str): PoS of vocabularies
-      vocabs (list of dict): vocabularies with the same PoS
+      vocabs (iterable of VocabRecord): vocabularies with the same PoS
     """
 
     for v in vocabs:
@@ -198,43 +220,147 @@ class VocabPPT:
       #  pass
 
 
-  def _create_vocab(self):
+  def _create_vocab(self, previous=None):
     """Create vocab group slides, which are noun, adj, verb, etc, restrained by subclass variable ALLOWED_POSES
+
+    Records are streamed from csv file in one pass, so slides of different PoS are created interleaved,
+    and words per PoS are counted in ``self.pos_counts``. Slides of records unchanged since the
+    previous build are copied from it instead of being rendered again.
+
+    Args:
+      previous (_PreviousDeck): previous build of the deck, None renders every record without hashing it
+
+    Returns:
+      tuple: ``(groups, records)``, ``groups`` is a dict, key is PoS, value is list of slides of the PoS, title slide first, in the order they are shown, ``records`` is a list of ``(hash, pos, slides)`` per record in csv order
     """
 
-    for pos, ws in self.word_distribution.items():
-      if len(ws) > 0:
-        subtitle = self.__class__._metainfo.get_pos_cn_name(pos)
-        title = self.__class__._metainfo.get_pos_cn_name(pos).upper()
+    cls = self.__class__
+    metainfo = cls._metainfo
+    slides = self._deck.slides
+    groups = {}
+    pos_counts = {}
+    records = []
+
+    for row in iter_csv(self._sourcefile):
+      digest = _record_hash(row) if previous is not None else None
+      reused = previous.pop(digest) if previous is not None else None
+      if reused is None:
+        v = VocabRecord.from_row(row, metainfo)
+        pos = v.pos
+      else:
+        pos = reused["pos"]
+      if pos not in cls.ALLOWED_POSES:
+        records.append((digest, pos, []))
+        continue
+      mark = len(slides)
+      if pos not in groups:
+        groups[pos] = []
+        pos_counts[pos] = 0
+        subtitle = metainfo.get_pos_cn_name(pos)
+        title = metainfo.get_pos_cn_name(pos).upper()
         self._create_vocab_title(title, subtitle)
-        self._create_vocab_group(pos, ws)
+      first = len(slides)
+      if reused is None:
+        self._create_vocab_group(pos, [v])
+        self.rebuilt_records += 1
+      else:
+        for entry in reused["slides"]:
+          slide = self._deck.reuse_slide(entry["layout"], previous.read(entry["part"]))
+          if entry["notes"] is not None:
+            self._set_notes(slide, entry["notes"])
+        self.reused_records += 1
+      groups[pos].extend(slides[mark:])
+      records.append((digest, pos, slides[first:]))
+      pos_counts[pos] += 1
+
+    self.pos_counts = pos_counts
+    return groups, records
 
   def _save_ppt(self, destfile):
-    """Save ppt object into file
+    """Save ppt object into file, or into memory if ``destfile`` is None, pruning unused slide layouts first in compact mode
+    """
+
+    return self._deck.save(destfile)
+
+  @property
+  def pruned_bytes(self):
+    """int: bytes left out of the saved pptx by pruning unused slide layouts and their media
     """
 
-    self._prs.save(destfile)
+    return self._deck.pruned_bytes
 
-  def convert_to_ppt(self, destfile='test.pptx'):
+  def save_preview(self, destfile, slides=6):
+    """Save a trimmed copy of the converted ppt, holding only the slides shown in preview
+
+    Args:
+      destfile (str or file): pptx file path or writable binary file, None saves into memory
+      slides (int): number of leading slides kept, e.g, opening, statistics and first contents
+
+    Returns:
+      io.BytesIO: pptx content if ``destfile`` is None
+    """
+
+    return self._deck.save_preview(destfile, slides)
+
+  def convert_to_ppt(self, destfile='test.pptx', engine="add_slide", notes=True, incremental=False, deterministic=False, compact=False):
     """Convert csv file containing vocabulary information into pptx file
 
     Args:
-      destfile (str): pptx file path
+      destfile (str or file): pptx file path or writable binary file, None saves into memory
+      engine (str): slide rendering engine, ``add_slide`` or ``stamp``, see :data:`linguappt.deck.ENGINES`
+      notes (bool or str): speaker notes with the word, ``True``, ``False`` to skip notes, or ``"lazy"`` to create notes slides on save, see :data:`linguappt.deck.NOTES`
+      incremental (bool): reuse slides of records unchanged since the previous build of ``destfile``, whose record hashes are kept in the sidecar file ``destfile + ".records.json"``, counted in ``self.reused_records`` and ``self.rebuilt_records``
+      deterministic (bool): save the same bytes for the same csv file and title, see :meth:`linguappt.deck.Deck.save`
+      compact (bool): leave slide layouts no slide uses, and media only they use, out of the pptx, the saved size is reported by :attr:`pruned_bytes`
+
+    Returns:
+      io.BytesIO: pptx content if ``destfile`` is None
     """
 
-    self._create_opening()
+    if incremental and not isinstance(destfile, str):
+      raise ValueError("incremental build needs destfile to be a file path")
+    self._deck.engine = engine
+    self._deck.notes = notes
+    self._deck.deterministic = deterministic
+    self._deck.compact = compact
+
+    build = self._build_key(notes) if incremental else None
+    previous = _PreviousDeck.open(destfile, build) if incremental else None
+    try:
+      self._create_opening()
+      groups, records = self._create_vocab(previous)
+    finally:
+      if incremental:
+        previous.close()
     self._create_statistics()
-    self._create_vocab()
     self._create_ending()
 
-    self._save_ppt(destfile)    
+    # statistics slide needs the counts of the whole csv file, so it is created after the vocab slides and moved to its place
+    slides = self._deck.slides
+    opening, statistics, ending = slides[0], slides[-2], slides[-1]
+    self._deck.reorder_slides([opening, statistics] + [s for group in groups.values() for s in group] + [ending])
+
+    result = self._save_ppt(destfile)
+    if incremental:
+      _PreviousDeck.write_records(destfile, build, records)
+    elif isinstance(destfile, str):
+      _PreviousDeck.remove_records(destfile)
+    return result
+
+  def _build_key(self, notes):
+    """Describe everything besides the records that reused slides depend on
+    """
+
+    with open(self._template, "rb") as f:
+      template = hashlib.sha256(f.read()).hexdigest()
+    return {"version": __version__, "class": self.__class__.__name__, "template": template, "notes": notes is not False}
 
   @abstractmethod
   def _create_noun(self, v):
     """Create slide for vocabulary with PoS as noun
 
     Args:
-      v (dict): vocabuary object, its keys should be the same as defined in subclass variable ``content_keys``
+      v (VocabRecord): vocabuary object, decoded from a record (one line) in csv file
     """
     pass
 
@@ -243,7 +369,7 @@ class VocabPPT:
     """Create slide for vocabulary with PoS as verb 
 
     Args:
-      v (dict): vocabuary object, its keys should be the same as defined in subclass variable ``content_keys``
+      v (VocabRecord): vocabuary object, decoded from a record (one line) in csv file
     """
     pass
 
@@ -252,7 +378,88 @@ class VocabPPT:
     """Create slide for vocabulary with PoS as adjective 
 
     Args:
-      v (dict): vocabuary object, its keys should be the same as defined in subclass variable ``content_keys``
+      v (VocabRecord): vocabuary object, decoded from a record (one line) in csv file
     """
     pass
 
+
+def _record_hash(row):
+  return hashlib.sha1(json.dumps(row, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class _PreviousDeck:
+  """Slides of the previous build of a deck, looked up by record hash
+  """
+
+  def __init__(self, content=None, records=()):
+    self._zip = None if content is None else zipfile.ZipFile(io.BytesIO(content))
+    self._records = {}
+    for record in records:
+      if record["slides"] is not None:
+        self._records.setdefault(record["hash"], []).append(record)
+
+  @classmethod
+  def open(cls, destfile, build):
+    """Open previous build of destfile, holding no slides if it is missing, unreadable, built differently or overwritten since
+    """
+
+    try:
+      with open(destfile + ".records.json") as f:
+        sidecar = json.load(f)
+      with open(destfile, "rb") as f:
+        content = f.read()
+      if sidecar["build"] == build and sidecar["pptx"] == hashlib.sha256(content).hexdigest():
+        return cls(content, sidecar["records"])
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+      pass
+    return cls()
+
+  @staticmethod
+  def write_records(destfile, build, records):
+    """Write record hashes and slide locations of the deck just saved into its sidecar file, with the hash of the saved pptx
+    """
+
+    entries = [{"hash": digest, "pos": pos, "slides": _slide_entries(slides)} for digest, pos, slides in records]
+    h = hashlib.sha256()
+    with open(destfile, "rb") as f:
+      for chunk in iter(lambda: f.read(1 << 20), b""):
+        h.update(chunk)
+    with open(destfile + ".records.json", "w") as f:
+      json.dump({"build": build, "pptx": h.hexdigest(), "records": entries}, f, ensure_ascii=False)
+
+  @staticmethod
+  def remove_records(destfile):
+    """Remove the sidecar file of destfile, which is no longer an incremental build
+    """
+
+    try:
+      os.remove(destfile + ".records.json")
+    except FileNotFoundError:
+      pass
+
+  def pop(self, digest):
+    """Take saved record with hash, None if there is none
+    """
+
+    entries = self._records.get(digest)
+    return entries.pop(0) if entries else None
+
+  def read(self, partname):
+    return self._zip.read(partname.lstrip("/"))
+
+  def close(self):
+    if self._zip is not None:
+      self._zip.close()
+
+
+def _slide_entries(slides):
+  """Locate saved slides of a record, None if any of them relates to parts other than its layout and notes
+  """
+
+  entries = []
+  for slide in slides:
+    if any(rel.reltype not in (RT.SLIDE_LAYOUT, RT.NOTES_SLIDE) for rel in slide.part.rels.values()):
+      return None
+    notes = slide.notes_slide.notes_text_frame.text if slide.has_notes_slide else None
+    entries.append({"layout": slide.slide_layout.name, "part": str(slide.part.partname), "notes": notes})
+  return entries
@@ -0,0 +1,55 @@
+import json
+
+
+class VocabRecord:
+  """Vocabulary record, whose json columns are decoded once when it is read from csv file
+
+  Attributes:
+    word (str): vocabulary
+    dict_pos (str): PoS tag from dictionary, e.g, ``n.``, ``vt.vi.``
+    pos (str): PoS classified from ``dict_pos`` by meta info, e.g, ``noun``, ``verb``
+    meanings (list of str): meanings, split from comma separated ``meaning`` column
+    extension (dict): decoded ``extension`` column, ``None`` if the column is empty
+    variations (dict): decoded ``variations`` column, ``None`` if the column is empty
+    examples (list of dict): decoded ``examples`` column, each has ``original`` and ``translated``
+  """
+
+  __slots__ = ("word", "dict_pos", "pos", "meanings", "extension", "variations", "examples")
+
+  def __init__(self, word, dict_pos, pos, meanings, extension=None, variations=None, examples=None):
+    self.word = word
+    self.dict_pos = dict_pos
+    self.pos = pos
+    self.meanings = meanings
+    self.extension = extension
+    self.variations = variations
+    self.examples = examples if examples is not None else []
+
+  @classmethod
+  def from_row(cls, row, metainfo):
+    """Decode record from csv row
+
+    Args:
+      row (dict): csv row, its keys are ``content_keys`` of vocabulary ppt class
+      metainfo (type): vocabulary meta info class, which classifies ``dict_pos`` by ``get_pos``
+
+    Returns:
+      VocabRecord: decoded record
+    """
+
+    return cls(
+      row["word"],
+      row["dict_pos"],
+      metainfo.get_pos(row["dict_pos"]),
+      row["meaning"].split(","),
+      _loads(row["extension"]),
+      _loads(row["variations"]),
+      _loads(row["examples"]),
+    )
+
+  def __repr__(self):
+    return "VocabRecord({!r}, {!r})".format(self.word, self.dict_pos)
+
+
+def _loads(column):
+  return json.loads(column) if column != "" else None
@@ -0,0 +1,299 @@
+from linguappt import media
+from linguappt.batch import run_job
+from linguappt.template_cache import prewarm_templates
+from linguappt.office import enable_office_pool, disable_office_pool
+import itertools
+import json
+import multiprocessing
+import multiprocessing.util
+import os
+import socketserver
+import sys
+import threading
+
+COMMANDS = ("meta2media", "ppt")
+"""Job commands accepted by :class:`WorkerPool`
+
+  * ``meta2media``: keys are the arguments of :func:`linguappt.media.meta2media`
+  * ``ppt``: keys are :data:`linguappt.batch.MANIFEST_KEYS`, optionally ``engine`` and ``notes``
+"""
+
+
+def run_command(job):
+  """Run one job in the current process
+
+  Args:
+    job (dict): ``cmd``, one of :data:`COMMANDS`, default is ``meta2media``, and its arguments
+
+  Yields:
+    dict: phase event of the job
+  """
+
+  args = {k: v for k, v in job.items() if k not in ("id", "cmd")}
+  cmd = job.get("cmd", "meta2media")
+  if cmd == "meta2media":
+    yield from media.meta2media(**args)
+  elif cmd == "ppt":
+    engine = args.pop("engine", "add_slide")
+    notes = args.pop("notes", True)
+    yield from run_job(args, engine, notes=notes)
+  else:
+    raise ValueError("unknown cmd {}, expected one of {}".format(cmd, ", ".join(COMMANDS)))
+
+
+_events = None
+
+def _init_worker(events, office):
+  global _events
+  _events = events
+  if office > 0:
+    enable_office_pool(office)
+    multiprocessing.util.Finalize(None, disable_office_pool, exitpriority=10)
+
+def _run(key, job):
+  """Run job in a worker process, putting its events to the shared queue
+
+  The first message tells the pid of the worker, so the job can be failed if the worker dies. The
+  queue is written synchronously, so the message is not lost if the worker exits right after.
+  """
+
+  _events.put((key, {_PID: os.getpid()}))
+  try:
+    for event in run_command(job):
+      _events.put((key, dict(event, id=job.get("id"))))
+  except Exception as e:
+    _events.put((key, {"id": job.get("id"), "msg": "Fail job", "error": "{}: {}".format(type(e).__name__, e), "done": True}))
+  else:
+    _events.put((key, {"id": job.get("id"), "msg": "Finish job", "done": True}))
+
+
+_PID = "_pid"
+
+_WATCH_SECONDS = 1
+
+
+def _fail_event(job_id, error):
+  return {"id": job_id, "msg": "Fail job", "error": error, "done": True}
+
+
+class WorkerPool:
+  """Pre-forked workers sharing templates parsed once in the parent process
+
+  The parent imports ``linguappt`` and parses every registered template before forking, so workers
+  start warm and share the parsed templates copy-on-write. Events of all jobs come back through
+  one queue and are routed to the sink of their job, the last event of a job has ``"done": True``.
+  A job whose worker dies, or which can not be run at all, ends with a ``Fail job`` event.
+  """
+
+  def __init__(self, processes=None, office=0):
+    """Parse templates and fork workers
+
+    Args:
+      processes (int): number of worker processes, default is the number of cpus
+      office (int): number of warm office instances started by each worker for pdf conversion, 0 launches office per conversion
+    """
+
+    prewarm_templates()
+    ctx = multiprocessing.get_context("fork")
+    self._events = ctx.SimpleQueue()
+    self._pool = ctx.Pool(processes, initializer=_init_worker, initargs=(self._events, office))
+    self._sinks = {}
+    self._running = {}
+    self._lost = 0
+    self._keys = itertools.count()
+    self._lock = threading.Lock()
+    self._idle = threading.Condition(self._lock)
+    self._closing = threading.Event()
+    self._router = threading.Thread(target=self._route, daemon=True)
+    self._router.start()
+    self._watcher = threading.Thread(target=self._watch, daemon=True)
+    self._watcher.start()
+
+  def submit(self, job, sink):
+    """Queue job, ``sink`` is called with every event of the job from the routing thread
+
+    Args:
+      job (dict): job, see :func:`run_command`
+      sink (callable): called with each event as dict
+    """
+
+    key = next(self._keys)
+    job_id = job.get("id") if isinstance(job, dict) else None
+    with self._lock:
+      self._sinks[key] = (job_id, sink)
+
+    def failed(e):
+      self._events.put((key, _fail_event(job_id, "{}: {}".format(type(e).__name__, e))))
+
+    self._pool.apply_async(_run, (key, job), error_callback=failed)
+
+  def _route(self):
+    while True:
+      key, event = self._events.get()
+      if key is None:
+        return
+      with self._lock:
+        if _PID in event:
+          self._running[key] = event[_PID]
+          continue
+        if event.get("done"):
+          self._running.pop(key, None)
+          job_id, sink = self._sinks.pop(key, (None, None))
+        else:
+          job_id, sink = self._sinks.get(key, (None, None))
+      if sink is not None:
+        sink(event)
+      if event.get("done"):
+        self._notify_idle()
+
+  def _watch(self):
+    while not self._closing.wait(_WATCH_SECONDS):
+      self._fail_dead_workers()
+
+  def _fail_dead_workers(self):
+    """End jobs whose worker process has exited without finishing them
+    """
+
+    with self._lock:
+      dead = [key for key, pid in self._running.items() if not _alive(pid)]
+      ended = [(self._sinks.pop(key, (None, None)), self._running.pop(key)) for key in dead]
+      self._lost += len(dead)
+    for (job_id, sink), pid in ended:
+      if sink is not None:
+        sink(_fail_event(job_id, "worker {} exited".format(pid)))
+    if len(ended) > 0:
+      self._notify_idle()
+
+  def _notify_idle(self):
+    with self._lock:
+      self._idle.notify_all()
+
+  def close(self):
+    """Wait for queued jobs, then stop workers
+
+    Tasks of jobs whose worker died are never finished by the pool, so it is terminated once all
+    other jobs are done instead of being joined.
+    """
+
+    self._pool.close()
+    with self._lock:
+      self._idle.wait_for(lambda: len(self._sinks) == 0)
+      lost = self._lost
+    if lost > 0:
+      self._pool.terminate()
+    else:
+      self._pool.join()
+    self._closing.set()
+    self._watcher.join()
+    self._events.put((None, None))
+    self._router.join()
+
+
+class _JobStream:
+  """Json lines writer that counts jobs whose events are not all written yet
+  """
+
+  def __init__(self, write):
+    self._write = write
+    self._pending = 0
+    self._cond = threading.Condition()
+
+  def add(self):
+    with self._cond:
+      self._pending += 1
+
+  def __call__(self, event):
+    with self._cond:
+      try:
+        self._write(json.dumps(event, ensure_ascii=False) + "\n")
+      except OSError:
+        pass # client has gone, keep counting so the connection can finish
+      if event.get("done"):
+        self._pending -= 1
+        self._cond.notify_all()
+
+  def wait(self, timeout=None):
+    """Wait until every added job has written its last event
+
+    Args:
+      timeout (float): seconds to wait, default is waiting forever
+
+    Returns:
+      bool: False if jobs are still pending after ``timeout``
+    """
+
+    with self._cond:
+      return self._cond.wait_for(lambda: self._pending == 0, timeout)
+
+
+def _submit_lines(pool, lines, stream):
+  for line in lines:
+    if line.strip() == "":
+      continue
+    stream.add()
+    try:
+      job = json.loads(line)
+    except ValueError as e:
+      stream({"id": None, "msg": "Fail job", "error": "{}: {}".format(type(e).__name__, e), "done": True})
+      continue
+    pool.submit(job, stream)
+  stream.wait()
+
+
+def serve_stdin(pool, stdin=None, stdout=None):
+  """Read json line jobs from stdin until end of file, writing events to stdout
+
+  Args:
+    pool (WorkerPool): workers running jobs
+    stdin (file): job lines, default is ``sys.stdin``
+    stdout (file): event lines, default is ``sys.stdout``
+  """
+
+  stdin = sys.stdin if stdin is None else stdin
+  stdout = sys.stdout if stdout is None else stdout
+
+  def write(text):
+    stdout.write(text)
+    stdout.flush()
+
+  _submit_lines(pool, stdin, _JobStream(write))
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+  def handle(self):
+    def write(text):
+      self.wfile.write(text.encode("utf-8"))
+      self.wfile.flush()
+
+    lines = (line.decode("utf-8") for line in self.rfile)
+    _submit_lines(self.server.pool, lines, _JobStream(write))
+
+
+def make_server(pool, path):
+  """Create Unix socket server, each connection sends json line jobs and receives their events
+
+  Args:
+    pool (WorkerPool): workers running jobs
+    path (str): socket path, an existing socket file is replaced
+
+  Returns:
+    socketserver.ThreadingUnixStreamServer: server, call ``serve_forever`` to accept connections
+  """
+
+  if os.path.exists(path):
+    os.unlink(path)
+  server = socketserver.ThreadingUnixStreamServer(path, _Handler)
+  server.daemon_threads = True
+  server.pool = pool
+  return server
+
+
+def _alive(pid):
+  try:
+    os.kill(pid, 0)
+  except ProcessLookupError:
+    return False
+  except PermissionError:
+    pass
+  return True
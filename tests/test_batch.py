@@ -0,0 +1,58 @@
+from linguappt.batch import read_manifest, run_batch
+import json
+import os
+
+def _write_vocab(path):
+  rows = [
+    "word\tmeaning\tdict_pos\tfrom\textension\tvariations\texamples",
+    "book\t书\tn.\tdict\t\t\t[]",
+    "good\t好\tadj.\tdict\t\t\t[]",
+  ]
+  path.write_text("\n".join(rows) + "\n")
+
+def test_batch(tmp_path):
+  _write_vocab(tmp_path / "vocab.csv")
+  jobs = [
+    {"ptype": "VOCAB", "lang": "en", "source": str(tmp_path / "vocab.csv"), "title": "t", "dest": str(tmp_path / "out" / "a.pptx")},
+    {"ptype": "VOCAB", "lang": "xx", "source": str(tmp_path / "vocab.csv"), "title": "t", "dest": str(tmp_path / "out" / "b.pptx")},
+  ]
+  manifest = tmp_path / "manifest.jsonl"
+  manifest.write_text("\n".join(json.dumps(job) for job in jobs))
+  assert read_manifest(str(manifest)) == jobs
+
+  events = list(run_batch(read_manifest(str(manifest)), processes=2))
+  finished = {e["job"]: e for e in events if e["step"] == 2}
+  assert "seconds" in finished[1]
+  assert "error" in finished[2]
+  assert os.path.isfile(jobs[0]["dest"])
+
+def test_read_csv_manifest(tmp_path):
+  manifest = tmp_path / "manifest.csv"
+  manifest.write_text("ptype,lang,source,title,dest\nSKG,de,a.json,t,a.pptx\n")
+  assert read_manifest(str(manifest))[0]["lang"] == "de"
+
+def _dying_job(job, *args):
+  if job["title"] == "die":
+    os._exit(1)
+  return [{"step": 1, "msg": "Start ppt generation", "dest": job["dest"]}, {"step": 2, "msg": "Finish ppt generation"}]
+
+def test_batch_worker_dies(monkeypatch):
+  from linguappt import batch
+  monkeypatch.setattr(batch, "run_job", _dying_job)
+  jobs = [{"title": title, "dest": "{}.pptx".format(i)} for i, title in enumerate(["die", "t", "t", "t"])]
+
+  events = list(run_batch(jobs, processes=2))
+  assert [e["job"] for e in events if e["step"] == 1] == [1, 2, 3, 4]
+  finished = {e["job"]: e for e in events if e["step"] == 2}
+  assert sorted(e["job"] for e in events if e["step"] == 2) == [1, 2, 3, 4]
+  assert "error" in finished[1]
+  assert finished[4]["msg"] == "Finish ppt generation"
+
+def test_batch_without_notes(tmp_path):
+  from pptx import Presentation
+  _write_vocab(tmp_path / "vocab.csv")
+  jobs = [{"ptype": "VOCAB", "lang": "en", "source": str(tmp_path / "vocab.csv"), "title": "t", "dest": str(tmp_path / "a.pptx")}]
+
+  events = list(run_batch(jobs, processes=1, notes=False))
+  assert "seconds" in events[-1]
+  assert not any(slide.has_notes_slide for slide in Presentation(jobs[0]["dest"]).slides)
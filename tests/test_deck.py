@@ -0,0 +1,114 @@
+from linguappt.deck import Deck
+from linguappt import SpanishVocabPPT
+from pptx import Presentation
+import pytest
+import zipfile
+
+def test_deck_add_slide():
+  deck = Deck(SpanishVocabPPT)
+
+  for layout in deck.prs.slide_layouts:
+    slide, holders = deck.add_slide(layout.name)
+    assert slide.slide_layout == layout
+    for ph in slide.shapes.placeholders:
+      idx = ph.placeholder_format.idx
+      assert holders[idx]._element is ph._element
+
+  with pytest.raises(KeyError):
+    holders[99]
+
+def test_deck_stamp():
+  decks = [Deck(SpanishVocabPPT, engine=engine) for engine in ("add_slide", "stamp")]
+  for deck in decks:
+    for name in ["Opening", "Default", "Default", "Thanks", "Default"]:
+      slide, holders = deck.add_slide(name)
+      if name != "Thanks":
+        holders[10].text_frame.text = name
+
+  expected, stamped = [[(s.part.partname, s.part.blob) for s in deck.prs.slides] for deck in decks]
+  assert expected == stamped
+
+  with pytest.raises(ValueError):
+    decks[0].engine = "xxx"
+
+def test_deck_allocation():
+  deck = Deck(SpanishVocabPPT)
+  prs = Deck(SpanishVocabPPT).prs
+  for i in range(3):
+    slide, holders = deck.add_slide("Default")
+    deck.set_notes(slide, str(i))
+    slide = prs.slides.add_slide(prs.slide_layouts.get_by_name("Default"))
+    slide.notes_slide.notes_text_frame.text = str(i)
+
+  def allocation(prs):
+    return [(sldId.id, sldId.rId, prs.part.related_part(sldId.rId).partname, prs.slides.get(sldId.id).notes_slide.part.partname) for sldId in prs.slides._sldIdLst]
+
+  assert allocation(deck.prs) == allocation(prs)
+  assert deck.prs.slides[2].notes_slide.notes_text_frame.text == "2"
+
+def test_deck_notes():
+  deck = Deck(SpanishVocabPPT, notes=False)
+  slide, _ = deck.add_slide("Default")
+  deck.set_notes(slide, "casa")
+  assert not slide.has_notes_slide
+
+  deck.notes = "lazy"
+  slides = [deck.add_slide("Default")[0] for _ in range(2)]
+  for slide in slides:
+    deck.set_notes(slide, "casa")
+  assert not slides[0].has_notes_slide
+  deck.flush_notes()
+  assert [s.notes_slide.notes_text_frame.text for s in slides] == ["casa", "casa"]
+
+  with pytest.raises(ValueError):
+    deck.notes = "xxx"
+
+def test_deck_reorder_slides():
+  deck = Deck(SpanishVocabPPT)
+  prs = Deck(SpanishVocabPPT).prs
+  for name in ["Opening", "Default", "Thanks"]:
+    slide, _ = deck.add_slide(name)
+    deck.set_notes(slide, name)
+  for name in ["Opening", "Thanks", "Default"]:
+    slide = prs.slides.add_slide(prs.slide_layouts.get_by_name(name))
+    slide.notes_slide.notes_text_frame.text = name
+
+  opening, default, thanks = deck.slides
+  deck.reorder_slides([opening, thanks, default])
+  assert [(s.part.partname, s.part.blob, s.notes_slide.part.partname) for s in deck.prs.slides] == [(s.part.partname, s.part.blob, s.notes_slide.part.partname) for s in prs.slides]
+  assert deck.prs.part.blob == prs.part.blob
+
+  with pytest.raises(ValueError):
+    deck.reorder_slides([opening, thanks])
+
+def test_deck_save_preview(tmp_path):
+  deck = Deck(SpanishVocabPPT)
+  for name in ["Opening", "Default", "Default", "Thanks"]:
+    slide, _ = deck.add_slide(name)
+    deck.set_notes(slide, name)
+
+  deck.save(str(tmp_path / "full.pptx"))
+  deck.save_preview(str(tmp_path / "preview.pptx"), 2)
+  deck.save(str(tmp_path / "again.pptx"))
+
+  assert len(Presentation(str(tmp_path / "preview.pptx")).slides) == 2
+  full = zipfile.ZipFile(str(tmp_path / "full.pptx"))
+  again = zipfile.ZipFile(str(tmp_path / "again.pptx"))
+  assert [full.read(n) for n in full.namelist() if n != "docProps/core.xml"] == [again.read(n) for n in again.namelist() if n != "docProps/core.xml"]
+
+def test_deck_prune_layouts(tmp_path):
+  sizes = {}
+  for compact in (False, True):
+    deck = Deck(SpanishVocabPPT, compact=compact)
+    for name in ["Opening", "Default", "Thanks"]:
+      deck.add_slide(name)
+    dest = tmp_path / "{}.pptx".format(compact)
+    deck.save(str(dest))
+    sizes[compact] = dest.stat().st_size
+
+  assert deck.pruned_bytes > 0
+  assert sizes[False] - sizes[True] >= deck.pruned_bytes // 2
+  prs = Presentation(str(dest))
+  assert [layout.name for layout in prs.slide_layouts] == ["Opening", "Default", "Thanks"]
+  assert [slide.slide_layout.name for slide in prs.slides] == ["Opening", "Default", "Thanks"]
+  assert deck.prune_layouts() == 0
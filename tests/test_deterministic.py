@@ -0,0 +1,58 @@
+from linguappt import (
+  EnglishVocabPPT, SpanishVocabPPT,
+  EnglishPhrasePPT, SpanishPhrasePPT, GermanPhrasePPT,
+  EnglishStructureKGPPT, SpanishStructureKGPPT, GermanStructureKGPPT,
+)
+import hashlib
+import json
+import pytest
+import time
+
+_VOCAB_HEADER = "word\tmeaning\tdict_pos\tfrom\textension\tvariations\texamples\n"
+
+def _sources(tmp_path):
+  examples = json.dumps([{"original": "a book", "translated": "一本书"}], ensure_ascii=False).replace('"', '""')
+  en = tmp_path / "en_vocab.csv"
+  en.write_text(_VOCAB_HEADER + "book\t书\tn.\tdict\t\t\t\"{}\"\nred\t红\tadj.\tdict\t\t\t[]\nrun\t跑\tv.\tdict\t\t\t[]\n".format(examples))
+  es = tmp_path / "es_vocab.csv"
+  es.write_text(_VOCAB_HEADER + "casa\t房子\tf.\tdict\t\t\t[]\nrojo\t红\tadj.\tdict\t\t\t[]\nmuy\t很\tadv.\tdict\t\t\t[]\n")
+  phrase = tmp_path / "phrase.csv"
+  sentence = json.dumps({"text": "I read a book", "meaning": "我读书"}, ensure_ascii=False).replace('"', '""')
+  nps = json.dumps([{"text": "a book", "meaning": "一本书"}], ensure_ascii=False).replace('"', '""')
+  verbs = json.dumps([{"text": "read", "lemma": "read", "form": "verb, present tense"}]).replace('"', '""')
+  phrase.write_text("sentence\tnoun_phrases\tverbs\n\"{}\"\t\"{}\"\t\"{}\"\n".format(sentence, nps, verbs))
+  skg = tmp_path / "skg.json"
+  skg.write_text(json.dumps([{
+    "sentence": {"text": "I read a book", "meaning": "我读书"},
+    "structure": [{"text": "I", "meaning": "我", "explanation": True}, {"text": "read", "meaning": "读", "explanation": False}],
+    "structure_rep": "S V O",
+    "kg": {"tense": [{"text": "present"}], "vocab": [{"text": "book"}]},
+  }], ensure_ascii=False))
+  return {"vocab_en": en, "vocab_es": es, "phrase": phrase, "skg": skg}
+
+_DECKS = [
+  (EnglishVocabPPT, "vocab_en"), (SpanishVocabPPT, "vocab_es"),
+  (EnglishPhrasePPT, "phrase"), (SpanishPhrasePPT, "phrase"), (GermanPhrasePPT, "phrase"),
+  (EnglishStructureKGPPT, "skg"), (SpanishStructureKGPPT, "skg"), (GermanStructureKGPPT, "skg"),
+]
+
+@pytest.mark.parametrize("cls,source", _DECKS, ids=[cls.__name__ for cls, _ in _DECKS])
+def test_deterministic_save(tmp_path, monkeypatch, cls, source):
+  sources = _sources(tmp_path)
+  first = cls(str(sources[source]), "title").convert_to_ppt(None, deterministic=True).getvalue()
+  # a later build, zip timestamps of a plain save would differ
+  now = time.time()
+  monkeypatch.setattr(time, "time", lambda: now + 3600)
+  dest = tmp_path / "second.pptx"
+  cls(str(sources[source]), "title").convert_to_ppt(str(dest), deterministic=True)
+  assert hashlib.sha256(first).hexdigest() == hashlib.sha256(dest.read_bytes()).hexdigest()
+
+@pytest.mark.parametrize("cls,source", _DECKS, ids=[cls.__name__ for cls, _ in _DECKS])
+def test_compact_leaves_template_cache(tmp_path, cls, source):
+  sources = _sources(tmp_path)
+  plain = cls(str(sources[source]), "title").convert_to_ppt(None, deterministic=True).getvalue()
+  compact = cls(str(sources[source]), "title")
+  compact.convert_to_ppt(None, deterministic=True, compact=True)
+  assert compact.pruned_bytes > 0
+  again = cls(str(sources[source]), "title").convert_to_ppt(None, deterministic=True).getvalue()
+  assert again == plain
@@ -1,4 +1,9 @@
-from linguappt.lib import readCSV, pptx2pdf, pdf2images
+from linguappt.lib import readCSV, iter_csv, iter_json, pptx2pdf, pptx2pdf_async, pptx2pdf_many, PdfConversionError, pdf2images, _page_range, _page_chunks, _resize
+from linguappt import lib
+from PIL import Image
+import pytest
+import json
+import os
 
 def test_readCSV(capsys):
   none_existed_file = "xxxx.csv"
@@ -13,8 +18,98 @@ def test_readCSV(capsys):
   assert len(content) > 0
 
 
-def test_pdf2images():
-  pass
+def test_pdf2images(tmp_path):
+  with pytest.raises(ValueError):
+    pdf2images("test.pdf", str(tmp_path), fmt="gif")
+
+def test_resize():
+  image = Image.new("RGB", (1600, 900))
+  assert _resize(image, 800).size == (800, 450)
+  assert _resize(image, None) is image
+  assert _resize(image, 2000) is image
+
+def test_page_range():
+  assert _page_range(0, 6) == (1, 6)
+  assert _page_range(2, None) == (3, None)
+  assert _page_range(-3, None, 10) == (8, 10)
+  assert _page_range(0, -1, 10) == (1, 9)
+
+def test_page_chunks():
+  assert _page_chunks(1, 20, 8) == [(1, 8), (9, 16), (17, 20)]
+  assert _page_chunks(3, None, None) == [(3, None)]
 
 def test_pptx2pdf():
   pass
+
+def test_iter_csv():
+  records = iter_csv("en_phrase.forpptx.csv")
+  assert next(records) == readCSV("en_phrase.forpptx.csv")[0]
+
+def test_iter_json(tmp_path):
+  records = [{"sentence": "s{}".format(i), "kg": {"nodes": ["[", "]", ","]}} for i in range(10)]
+  array_file = tmp_path / "skg.json"
+  array_file.write_text(json.dumps(records, indent=2))
+  lines_file = tmp_path / "skg.jsonl"
+  lines_file.write_text("\n".join(json.dumps(e) for e in records))
+
+  assert list(iter_json(str(array_file), chunk_size=16)) == records
+  assert list(iter_json(str(lines_file), chunk_size=16)) == records
+  blank_file = tmp_path / "blank.jsonl"
+  blank_file.write_text("   \n\n")
+  assert list(iter_json(str(blank_file), chunk_size=2)) == []
+
+def test_iter_json_lines_unicode_separators(tmp_path):
+  records = [{"sentence": "a\u2028b\u0085c\x1cd"}, {"sentence": "e"}]
+  lines_file = tmp_path / "skg.jsonl"
+  lines_file.write_text("\n".join(json.dumps(e, ensure_ascii=False) for e in records), encoding="utf-8")
+
+  assert list(iter_json(str(lines_file))) == records
+
+def test_pptx2pdf_many(tmp_path):
+  soffice = tmp_path / "soffice"
+  soffice.write_text("""#!/bin/sh
+outdir=""
+while [ $# -gt 0 ]; do
+  case "$1" in
+    --outdir) outdir="$2"; shift;;
+    *broken*) ;;
+    *.pptx) name=$(basename "$1" .pptx); touch "$outdir/$name.pdf";;
+  esac
+  shift
+done
+""")
+  soffice.chmod(0o755)
+  decks = [str(tmp_path / "deck{}.pptx".format(i)) for i in range(5)]
+
+  pdfs = pptx2pdf_many(decks, str(tmp_path / "pdf"), chunk_size=2, soffice=str(soffice))
+  assert pdfs == [str(tmp_path / "pdf" / "deck{}.pdf".format(i)) for i in range(5)]
+
+  with pytest.raises(PdfConversionError) as e:
+    pptx2pdf_many(decks + [str(tmp_path / "broken.pptx")], str(tmp_path / "pdf"), chunk_size=2, soffice=str(soffice))
+  assert list(e.value.missing) == [str(tmp_path / "broken.pptx")]
+
+def test_pptx2pdf_own_profile(tmp_path, monkeypatch):
+  soffice = tmp_path / "soffice"
+  soffice.write_text("""#!/bin/sh
+for arg in "$@"; do
+  case "$arg" in
+    -env:UserInstallation=file://*) profile="${arg#-env:UserInstallation=file://}"; test -d "$profile" && echo "$profile" >> "$LOG";;
+  esac
+done
+sleep 0.2
+""")
+  soffice.chmod(0o755)
+  monkeypatch.setenv("PATH", str(tmp_path) + os.pathsep + os.environ["PATH"])
+  monkeypatch.setenv("LOG", str(tmp_path / "profiles.log"))
+
+  _, wait = pptx2pdf_async("deck.pptx", str(tmp_path / "pdf"))
+  pptx2pdf("deck.pptx", str(tmp_path / "pdf"))
+  assert wait() == 0
+  pptx2pdf("deck.pptx", str(tmp_path / "pdf"))
+  pptx2pdf("deck.pptx", str(tmp_path / "pdf"))
+  profiles = (tmp_path / "profiles.log").read_text().split()
+  # a running conversion has a profile of its own, later conversions reuse profiles
+  assert profiles[0] != profiles[1]
+  assert set(profiles) == set(profiles[:2])
+  lib._remove_profiles()
+  assert not any(os.path.exists(profile) for profile in profiles)
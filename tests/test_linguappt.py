@@ -1,5 +1,12 @@
 from linguappt import __version__
+import os
+import subprocess
+import sys
 
 
 def test_version():
   assert __version__ == '0.1.22'
+
+def test_lazy_import():
+  code = "import sys, linguappt, linguappt._entry.command; assert 'pptx' not in sys.modules; linguappt.EnglishVocabPPT; assert 'pptx' in sys.modules"
+  subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
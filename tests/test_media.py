@@ -0,0 +1,66 @@
+from linguappt.media import meta2media
+from linguappt.media_cache import MediaCache
+from linguappt import EnglishVocabPPT
+from pptx import Presentation
+
+def test_meta2media_preview(tmp_path):
+  source = tmp_path / "vocab.csv"
+  rows = ["word\tmeaning\tdict_pos\tfrom\textension\tvariations\texamples"]
+  rows += ["word{}\t词\tn.\tdict\t\t\t[]".format(i) for i in range(10)]
+  source.write_text("\n".join(rows) + "\n")
+
+  phases = meta2media("VOCAB", str(source), "en", "test", str(tmp_path / "pptx"), str(tmp_path / "pdf"), str(tmp_path / "img"), preview=True)
+  assert next(phases)["step"] == 1
+  assert next(phases)["step"] == 2
+  assert len(Presentation(str(tmp_path / "pptx" / "test.pptx")).slides) > 6
+  assert [p.name for p in (tmp_path / "pptx").iterdir()] == ["test.pptx"]
+  assert not (tmp_path / "pdf").exists()
+
+def test_convert_to_ppt_in_memory(tmp_path):
+  source = tmp_path / "vocab.csv"
+  source.write_text("word\tmeaning\tdict_pos\tfrom\textension\tvariations\texamples\nbook\t书\tn.\tdict\t\t\t[]\n")
+
+  vp = EnglishVocabPPT(str(source), "title")
+  pptx = vp.convert_to_ppt(None)
+  assert len(Presentation(pptx).slides) == 5
+  assert list(tmp_path.iterdir()) == [source]
+
+def test_meta2media_cache_hit(tmp_path):
+  source = tmp_path / "vocab.csv"
+  source.write_text("word\tmeaning\tdict_pos\tfrom\textension\tvariations\texamples\nbook\t书\tn.\tdict\t\t\t[]\n")
+  image = tmp_path / "0.jpg"
+  image.write_bytes(b"jpg")
+  cache = MediaCache(str(tmp_path / "cache"))
+  key = cache.key("VOCAB", "en", str(source), "title", EnglishVocabPPT, {"preview_slides": 6, "compact": False, "notes": True})
+  cache.put(key, b"pptx", b"pdf", [str(image)])
+
+  phases = list(meta2media("VOCAB", str(source), "en", "test", str(tmp_path / "pptx"), str(tmp_path / "pdf"), str(tmp_path / "img"), title="title", cache=cache))
+  assert [phase["step"] for phase in phases] == [1, 4]
+  assert phases[-1]["images_len"] == 1
+  assert phases[-1]["cache"] == {"status": "hit", "hits": 1, "misses": 0}
+  assert (tmp_path / "pptx" / "test.pptx").read_bytes() == b"pptx"
+  assert (tmp_path / "pdf" / "test.pdf").read_bytes() == b"pdf"
+  assert (tmp_path / "img" / "0.jpg").read_bytes() == b"jpg"
+
+def test_meta2media_preview_cache_hit(tmp_path):
+  source = tmp_path / "vocab.csv"
+  source.write_text("word\tmeaning\tdict_pos\tfrom\textension\tvariations\texamples\nbook\t书\tn.\tdict\t\t\t[]\n")
+  image = tmp_path / "0.jpg"
+  image.write_bytes(b"jpg")
+  cache = MediaCache(str(tmp_path / "cache"))
+  key = cache.key("VOCAB", "en", str(source), "title", EnglishVocabPPT, {"preview_slides": 6, "compact": False, "notes": True})
+  cache.put(key, b"pptx", b"pdf", [str(image)])
+
+  phases = list(meta2media("VOCAB", str(source), "en", "test", str(tmp_path / "pptx"), str(tmp_path / "pdf"), str(tmp_path / "img"), title="title", preview=True, cache=cache))
+  assert [phase["step"] for phase in phases] == [1, 4, 6]
+  assert phases[-1]["pdf"] == str(tmp_path / "pdf" / "test.pdf")
+  assert (tmp_path / "img" / "0.jpg").read_bytes() == b"jpg"
+
+def test_meta2media_without_notes(tmp_path):
+  source = tmp_path / "vocab.csv"
+  source.write_text("word\tmeaning\tdict_pos\tfrom\textension\tvariations\texamples\nbook\t书\tn.\tdict\t\t\t[]\n")
+
+  phases = meta2media("VOCAB", str(source), "en", "test", str(tmp_path / "pptx"), None, str(tmp_path / "img"), notes=False)
+  assert next(phases)["step"] == 1
+  assert next(phases)["step"] == 2
+  assert not any(slide.has_notes_slide for slide in Presentation(str(tmp_path / "pptx" / "test.pptx")).slides)
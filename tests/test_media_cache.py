@@ -0,0 +1,46 @@
+import pytest
+from linguappt.media_cache import MediaCache
+import os
+
+def test_put_get(tmp_path):
+  image = tmp_path / "0.jpg"
+  image.write_bytes(b"jpg")
+  cache = MediaCache(str(tmp_path / "cache"))
+  assert cache.get("a") is None
+  cache.put("a", b"pptx", None, [str(image)])
+
+  entry = cache.get("a")
+  assert entry["pptx"] and not entry["pdf"]
+  assert entry["images"] == ["0.jpg"]
+  assert open(os.path.join(entry["path"], "deck.pptx"), "rb").read() == b"pptx"
+  assert cache.get("a", ["pdf"]) is None
+  assert cache.stats() == {"hits": 1, "misses": 2}
+
+def test_evict_least_recently_used(tmp_path):
+  cache = MediaCache(str(tmp_path / "cache"), max_bytes=300)
+  cache.put("a", b"x" * 100)
+  cache.put("b", b"x" * 100)
+  os.utime(os.path.join(cache.root, "b", "meta.json"), (0, 0))
+  cache.put("c", b"x" * 100)
+  assert cache.get("a") is not None
+  assert cache.get("b") is None
+  assert cache.get("c") is not None
+
+def test_restore_race_is_miss(tmp_path):
+  cache = MediaCache(str(tmp_path / "cache"))
+  cache.put("a", b"pptx")
+
+  def evicted(entry):
+    raise FileNotFoundError(entry["path"])
+
+  assert cache.get("a", restore=evicted) is None
+  assert cache.stats() == {"hits": 0, "misses": 1}
+
+def test_size_index(tmp_path, monkeypatch):
+  cache = MediaCache(str(tmp_path / "cache"), max_bytes=1000)
+  cache.put("a", b"x" * 100)
+  cache.put("a", b"x" * 200)
+  monkeypatch.setattr(MediaCache, "_entries", lambda self: pytest.fail("entries walked under the cap"))
+  cache.put("b", b"x" * 100)
+  monkeypatch.undo()
+  assert cache._size() == sum(size for _, size, _ in cache._entries())
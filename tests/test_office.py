@@ -0,0 +1,40 @@
+from linguappt.office import OfficeInstance, OfficePool
+import pytest
+import time
+
+class _Instance(OfficeInstance):
+  def start(self):
+    self.running = True
+
+  def healthy(self):
+    return self.running
+
+  def convert(self, pptx, pdfpath):
+    if "hang" in pptx:
+      time.sleep(2)
+    with open(pdfpath, "w") as f:
+      f.write(pptx)
+
+  def stop(self):
+    self.running = False
+
+class _Pool(OfficePool):
+  def _new_instance(self, index):
+    return _Instance(index, self.workdir)
+
+def test_office_pool(tmp_path):
+  pool = _Pool(size=1, timeout=0.5).start()
+  try:
+    assert pool.convert("deck.pptx", str(tmp_path)) == str(tmp_path / "deck.pdf")
+    assert (tmp_path / "deck.pdf").read_text() == "deck.pptx"
+
+    with pytest.raises(TimeoutError):
+      pool.convert("hang.pptx", str(tmp_path))
+    instance = pool._instances[0]
+    assert instance.restarts == 1
+
+    instance.running = False
+    pool.convert("again.pptx", str(tmp_path))
+    assert instance.restarts == 2
+  finally:
+    pool.close()
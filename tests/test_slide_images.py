@@ -0,0 +1,40 @@
+from linguappt import EnglishVocabPPT
+from linguappt import slide_images
+from linguappt.slide_images import slide_fingerprints, pptx2images
+from pptx import Presentation
+import io
+
+def _deck(tmp_path, words):
+  source = tmp_path / "vocab.csv"
+  rows = ["{}\t词\tn.\tdict\t\t\t[]\n".format(w) for w in words]
+  source.write_text("word\tmeaning\tdict_pos\tfrom\textension\tvariations\texamples\n" + "".join(rows))
+  return EnglishVocabPPT(str(source), "title").convert_to_ppt(None).getvalue()
+
+def test_slide_fingerprints(tmp_path):
+  before = slide_fingerprints(_deck(tmp_path, ["book", "pen", "cup"]))
+  after = slide_fingerprints(_deck(tmp_path, ["book", "pencil", "cup"]))
+  assert len(before) == len(after) == 7
+  assert [i for i, (a, b) in enumerate(zip(before, after)) if a != b] == [4]
+
+def test_pptx2images_reuses_unchanged_slides(tmp_path, monkeypatch):
+  converted = []
+  def fake_pptx2pdf(pptx):
+    converted.append(len(Presentation(io.BytesIO(pptx)).slides))
+    return b"pdf"
+  def fake_pdf2images(pdf, imgfolder, fmt, quality, widths, indexes):
+    for index in indexes:
+      (tmp_path / "img" / "{}.jpg".format(index)).write_bytes(b"jpg")
+    return len(indexes)
+  monkeypatch.setattr(slide_images, "pptx2pdf", fake_pptx2pdf)
+  monkeypatch.setattr(slide_images, "pdf2images", fake_pdf2images)
+  (tmp_path / "img").mkdir()
+  imgdir = str(tmp_path / "img")
+
+  phases = list(pptx2images(_deck(tmp_path, ["book", "pen", "cup"]), imgdir))
+  assert phases[-1]["images_len"] == 7 and phases[-1]["reused"] == 0
+  phases = list(pptx2images(_deck(tmp_path, ["book", "pencil", "cup"]), imgdir))
+  assert phases[-1]["reused"] == 6
+  phases = list(pptx2images(_deck(tmp_path, ["book", "pencil"]), imgdir))
+  assert phases[-1]["images_len"] == 6
+  assert converted == [7, 1, 2]
+  assert sorted(p.name for p in (tmp_path / "img").iterdir()) == ["0.jpg", "1.jpg", "2.jpg", "3.jpg", "4.jpg", "5.jpg", "fingerprints.json"]
@@ -0,0 +1,30 @@
+from linguappt.template_cache import TemplateCache
+from linguappt import EnglishPhrasePPT, EnglishStructureKGPPT, EnglishVocabPPT
+
+def test_template_cache():
+  cache = TemplateCache(maxsize=2)
+
+  prs = cache.get(EnglishPhrasePPT)
+  prs.slides.add_slide(prs.slide_layouts.get_by_name("Opening"))
+  assert len(prs.slides) == 1
+  assert cache.misses == 1
+
+  prs = cache.get(EnglishPhrasePPT)
+  assert len(prs.slides) == 0
+  assert cache.hits == 1
+
+  assert cache.prewarm([EnglishStructureKGPPT, EnglishVocabPPT]) == 2
+  assert len(cache) == 2
+  cache.get(EnglishPhrasePPT)
+  assert cache.misses == 4
+
+def test_template_cache_share():
+  cache = TemplateCache()
+  prs, _ = cache.checkout(EnglishPhrasePPT, share=True)
+  layout = prs.slide_layouts.get_by_name("Opening")
+  prs.slides.add_slide(layout)
+
+  pristine, _ = cache.checkout(EnglishPhrasePPT, share=True)
+  assert len(pristine.slides) == 0
+  assert pristine.slide_layouts.get_by_name("Opening").part is layout.part
+  assert pristine.part is not prs.part
@@ -0,0 +1,34 @@
+from linguappt import EnglishPhrasePPT, EnglishStructureKGPPT, EnglishVocabPPT
+from linguappt.validation import SourceError
+import json
+import pytest
+
+def test_validate_csv(tmp_path):
+  source = tmp_path / "vocab.csv"
+  rows = [
+    "word\tmeaning\tdict_pos\tfrom\textension\tvariations\texamples",
+    "book\t书\tn.\tdict\t\t\t[]",
+    "read\t读\tv.\tdict\t{broken\t\t[]",
+    "run",
+    "good\t好\tadj.\tdict\t\t\t[]",
+  ]
+  source.write_text("\n".join(rows) + "\n")
+
+  errors = EnglishVocabPPT.validate_source(str(source))
+  assert [line for line, msg in errors] == [3, 4]
+
+  with pytest.raises(SourceError) as e:
+    EnglishVocabPPT(str(source), "title")
+  assert e.value.errors == errors
+
+def test_validate_header():
+  errors = EnglishPhrasePPT.validate_source("en_phrase.forpptx.csv")
+  assert len(errors) == 1
+  assert errors[0][0] == 1
+
+def test_validate_json(tmp_path):
+  source = tmp_path / "skg.json"
+  source.write_text(json.dumps([{"sentence": "x"}, 1]))
+
+  errors = EnglishStructureKGPPT.validate_source(str(source))
+  assert [line for line, msg in errors] == [1, 2]
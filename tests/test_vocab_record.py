@@ -0,0 +1,15 @@
+from linguappt.vocab_record import VocabRecord
+from linguappt.en._vocab_meta import _EnglishVocabMeta
+import pytest
+
+def test_vocab_record():
+  row = {"word": "houses", "meaning": "房子,家", "dict_pos": "n.", "from": "", "extension": '{"singular": "house", "plural": "houses"}', "variations": "", "examples": "[]"}
+  v = VocabRecord.from_row(row, _EnglishVocabMeta)
+
+  assert v.pos == "noun"
+  assert v.meanings == ["房子", "家"]
+  assert v.extension["plural"] == "houses"
+  assert v.variations is None
+  assert v.examples == []
+  with pytest.raises(AttributeError):
+    v.meaning = "房子"
@@ -3,3 +3,9 @@ from linguappt.en._vocab_meta import _EnglishVocabMeta
 def test_vocabmeta():
   pos = _EnglishVocabMeta.get_pos("v.vi.")
   assert pos == "verb"
+
+def test_vocabmeta_get_poses():
+  poses = _EnglishVocabMeta.get_poses(["n.", "vt.vi.", "unknown.", "adj."])
+  assert poses == ["noun", "verb", "other", "adj"]
+  assert _EnglishVocabMeta.get_pos("unknown.") == "other"
+  assert "unknown." not in _EnglishVocabMeta._pos_index
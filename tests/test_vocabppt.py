@@ -4,3 +4,51 @@ import pytest
 def test_phraseppt():
   with pytest.raises(TypeError):
     VocabPPT("./test.csv:")
+
+def test_incremental(tmp_path):
+  from linguappt import EnglishVocabPPT
+  import zipfile
+  header = "word\tmeaning\tdict_pos\tfrom\textension\tvariations\texamples\n"
+  rows = ["{}\t词\t{}\tdict\t\t\t[]\n".format(w, p) for w, p in [("book", "n."), ("run", "v."), ("red", "adj."), ("pen", "n.")]]
+  source = tmp_path / "vocab.csv"
+  source.write_text(header + "".join(rows))
+  dest = str(tmp_path / "inc.pptx")
+  vp = EnglishVocabPPT(str(source), "title")
+  vp.convert_to_ppt(dest, incremental=True)
+  assert (vp.reused_records, vp.rebuilt_records) == (0, 4)
+
+  source.write_text(header + "".join(rows[1:3] + ["cup\t杯\tn.\tdict\t\t\t[]\n", rows[0]]))
+  vp = EnglishVocabPPT(str(source), "title")
+  vp.convert_to_ppt(dest, incremental=True)
+  assert (vp.reused_records, vp.rebuilt_records) == (3, 1)
+
+  full = str(tmp_path / "full.pptx")
+  EnglishVocabPPT(str(source), "title").convert_to_ppt(full)
+  za, zb = zipfile.ZipFile(full), zipfile.ZipFile(dest)
+  assert za.namelist() == zb.namelist()
+  assert [n for n in za.namelist() if n != "docProps/core.xml" and za.read(n) != zb.read(n)] == []
+
+def test_incremental_overwritten(tmp_path):
+  from linguappt import EnglishVocabPPT
+  from pptx import Presentation
+  import os
+  header = "word\tmeaning\tdict_pos\tfrom\textension\tvariations\texamples\n"
+  a, b = tmp_path / "a.csv", tmp_path / "b.csv"
+  a.write_text(header + "book\t书\tn.\tdict\t\t\t[]\npen\t笔\tn.\tdict\t\t\t[]\n")
+  b.write_text(header + "cat\t猫\tn.\tdict\t\t\t[]\ndog\t狗\tn.\tdict\t\t\t[]\n")
+  dest = str(tmp_path / "deck.pptx")
+  EnglishVocabPPT(str(a), "title").convert_to_ppt(dest, incremental=True)
+  EnglishVocabPPT(str(b), "title").convert_to_ppt(dest)
+  assert not os.path.exists(dest + ".records.json")
+
+  # pptx overwritten by another tool, leaving a stale sidecar
+  EnglishVocabPPT(str(a), "title").convert_to_ppt(dest, incremental=True)
+  sidecar = open(dest + ".records.json").read()
+  EnglishVocabPPT(str(b), "title").convert_to_ppt(dest)
+  with open(dest + ".records.json", "w") as f:
+    f.write(sidecar)
+  vp = EnglishVocabPPT(str(a), "title")
+  vp.convert_to_ppt(dest, incremental=True)
+  assert vp.reused_records == 0
+  texts = [slide.notes_slide.notes_text_frame.text for slide in Presentation(dest).slides if slide.has_notes_slide]
+  assert texts == ["book", "pen"]
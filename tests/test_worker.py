@@ -0,0 +1,56 @@
+from linguappt.worker import WorkerPool, make_server
+import json
+import socket
+import threading
+
+def test_worker_socket(tmp_path):
+  source = tmp_path / "vocab.csv"
+  source.write_text("word\tmeaning\tdict_pos\tfrom\textension\tvariations\texamples\nbook\t书\tn.\tdict\t\t\t[]\n")
+  jobs = [
+    {"id": 1, "cmd": "ppt", "ptype": "VOCAB", "lang": "en", "source": str(source), "title": "t", "dest": str(tmp_path / "a.pptx")},
+    {"id": 2, "cmd": "unknown"},
+  ]
+
+  pool = WorkerPool(processes=1)
+  server = make_server(pool, str(tmp_path / "worker.sock"))
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  try:
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(tmp_path / "worker.sock"))
+    client.sendall("".join(json.dumps(job) + "\n" for job in jobs).encode("utf-8"))
+    client.shutdown(socket.SHUT_WR)
+    events = [json.loads(line) for line in client.makefile("rb")]
+    client.close()
+  finally:
+    server.shutdown()
+    server.server_close()
+    pool.close()
+
+  done = {e["id"]: e for e in events if e.get("done")}
+  assert done[1]["msg"] == "Finish job"
+  assert "error" in done[2]
+  assert [e["step"] for e in events if e["id"] == 1 and "step" in e] == [1, 2]
+
+def _dying_command(job):
+  import os
+  if job.get("cmd") == "die":
+    os._exit(1)
+  yield {"step": 1}
+
+def test_worker_failed_jobs_end(monkeypatch):
+  from linguappt import worker
+  monkeypatch.setattr(worker, "run_command", _dying_command)
+  events = []
+  stream = worker._JobStream(lambda text: events.append(json.loads(text)))
+  pool = WorkerPool(processes=1)
+  try:
+    for job in [{"id": 1, "cmd": "die"}, {"id": 2, "cmd": "ok", "arg": lambda: None}, {"id": 3, "cmd": "ok"}]:
+      stream.add()
+      pool.submit(job, stream)
+    assert stream.wait(timeout=30)
+  finally:
+    pool.close()
+
+  done = {e["id"]: e for e in events if e.get("done")}
+  assert done[1]["msg"] == done[2]["msg"] == "Fail job"
+  assert done[3]["msg"] == "Finish job"